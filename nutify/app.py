@@ -57,79 +57,116 @@ except ImportError:
 # Global timezone cache - initialized to UTC by default
 import pytz
 import sqlite3
+import contextlib
+import functools
 import logging
-from pathlib import Path
 
 # Initialize basic logging to capture timezone initialization
 logging.basicConfig(level=logging.INFO, 
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 timezone_logger = logging.getLogger('timezone')
 
+@functools.lru_cache(maxsize=64)
+def _tz(name):
+    """Resolve a timezone name, caching the result so zoneinfo is parsed only once per zone"""
+    # UTC is built into pytz, no zone file needs to be loaded for it
+    if name.upper() == 'UTC':
+        return pytz.UTC
+    # pytz loads only the requested zone file, never the full timezone list
+    return pytz.timezone(name)
+
+def _stat_or_none(path):
+    """Return os.stat(path), or None if the file does not exist (one syscall for exists+size+mode)"""
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+def _readable(path):
+    """Return True if path is an existing, non-empty file (single stat)"""
+    try:
+        return os.stat(path).st_size > 0
+    except OSError:
+        return False
+
 # Default to UTC initially
-CACHE_TIMEZONE = pytz.timezone('UTC')
+CACHE_TIMEZONE = pytz.UTC
+
+# Database location from settings, shared by every boot-time check
+from core.settings import INSTANCE_PATH, DB_NAME
+DB_PATH = os.path.join(INSTANCE_PATH, DB_NAME)
+
+# Result of the single boot-time database read: (timezone_str, has_initial_setup_table)
+_BOOT_DB_STATE = None
+
+def _bootstrap_from_db(db_path):
+    """
+    Open the database once and read everything needed at boot.
+    
+    Args:
+        db_path: Path to the SQLite database file
+        
+    Returns:
+        tuple: (timezone_str or None, has_initial_setup_table)
+    """
+    timezone_str = None
+    with contextlib.closing(sqlite3.connect(db_path)) as conn:
+        has_initial_setup_table = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name='ups_initial_setup'"
+        ).fetchone() is not None
+        
+        if has_initial_setup_table:
+            # Idempotent partial index so the configured-row lookup never scans the table
+            try:
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_ups_initial_setup_configured "
+                    "ON ups_initial_setup(is_configured) WHERE is_configured = 1"
+                )
+                conn.commit()
+            except sqlite3.OperationalError as e:
+                # Read-only or locked database, the lookup still works without the index
+                timezone_logger.debug(f"Could not create ups_initial_setup index: {str(e)}")
+            
+            row = conn.execute(
+                "SELECT timezone FROM ups_initial_setup WHERE is_configured = 1 LIMIT 1"
+            ).fetchone()
+            
+            if row and row[0]:
+                timezone_str = row[0]
+                timezone_logger.info(f"🌏 Loaded timezone from database: {timezone_str}")
+            else:
+                # Try any configuration if no configured one exists
+                row = conn.execute("SELECT timezone FROM ups_initial_setup LIMIT 1").fetchone()
+                if row and row[0]:
+                    timezone_str = row[0]
+                    timezone_logger.info(f"🌏 Loaded timezone from first available config: {timezone_str}")
+    
+    return timezone_str, has_initial_setup_table
 
 def initialize_timezone():
     """
     Initialize the global CACHE_TIMEZONE from database.
     Must be called before any other operation that requires timezone information.
     """
-    global CACHE_TIMEZONE
+    global CACHE_TIMEZONE, _BOOT_DB_STATE
     timezone_logger.info("Initializing global timezone cache")
     
-    # Find the instance path and database name
-    base_dir = Path(__file__).resolve().parent
-    instance_path = os.path.join(base_dir, 'instance')
-    db_name = 'nutify.db.sqlite'
-    db_path = os.path.join(instance_path, db_name)
-    
     # Default timezone is UTC
     timezone_str = 'UTC'
     
     # Check if database exists and has data
-    if os.path.exists(db_path) and os.path.getsize(db_path) > 0:
+    db_stat = _stat_or_none(DB_PATH)
+    if db_stat is not None and db_stat.st_size > 0:
         try:
-            # Use SQLAlchemy instead of direct SQLite access
-            from sqlalchemy import create_engine, MetaData, Table, select, Column, String, Integer, Boolean
-            from sqlalchemy.exc import SQLAlchemyError
-            
-            # Create a temporary engine - we'll create a proper DB connection later
-            engine = create_engine(f'sqlite:///{db_path}')
-            metadata = MetaData()
+            _BOOT_DB_STATE = _bootstrap_from_db(DB_PATH)
+            db_timezone, has_initial_setup_table = _BOOT_DB_STATE
             
-            # Define the table structure we need to query
-            ups_initial_setup = Table(
-                'ups_initial_setup', 
-                metadata,
-                Column('id', Integer, primary_key=True),
-                Column('timezone', String),
-                Column('is_configured', Boolean)
-            )
-            
-            # Check if table exists before trying to query it
-            if engine.dialect.has_table(engine.connect(), 'ups_initial_setup'):
-                # Use ORM-style query with configured=1 filter
-                with engine.connect() as conn:
-                    query = select(ups_initial_setup.c.timezone).where(
-                        ups_initial_setup.c.is_configured == 1
-                    ).limit(1)
-                    
-                    result = conn.execute(query).fetchone()
-                    
-                    if result and result[0]:
-                        timezone_str = result[0]
-                        timezone_logger.info(f"🌏 Loaded timezone from database: {timezone_str}")
-                    else:
-                        # Try any configuration if no configured one exists
-                        query = select(ups_initial_setup.c.timezone).limit(1)
-                        result = conn.execute(query).fetchone()
-                        
-                        if result and result[0]:
-                            timezone_str = result[0]
-                            timezone_logger.info(f"🌏 Loaded timezone from first available config: {timezone_str}")
-                        else:
-                            timezone_logger.info("No timezone found in database, using UTC")
-            else:
+            if not has_initial_setup_table:
                 timezone_logger.info("ups_initial_setup table does not exist yet, using UTC")
+            elif db_timezone:
+                timezone_str = db_timezone
+            else:
+                timezone_logger.info("No timezone found in database, using UTC")
         except Exception as e:
             timezone_logger.error(f"Error loading timezone from database: {str(e)}")
             timezone_logger.info("Using default timezone: UTC")
@@ -137,23 +174,18 @@ def initialize_timezone():
         timezone_logger.info("Database not found or empty, using default timezone: UTC")
     
     # Set the global timezone cache
-    CACHE_TIMEZONE = pytz.timezone(timezone_str)
+    CACHE_TIMEZONE = _tz(timezone_str)
     timezone_logger.info(f"CACHE_TIMEZONE initialized to: {CACHE_TIMEZONE.zone}")
 
 # Initialize timezone immediately
 initialize_timezone()
 
-from flask import Flask, render_template, request, jsonify, send_from_directory, redirect, url_for
-from flask_socketio import SocketIO, emit
+from flask import Flask, redirect, url_for
 import datetime
 import sys
 import threading
 import time
 from flask_talisman import Talisman
-import json
-from collections import deque
-from statistics import mean
-from sqlalchemy import text, inspect
 
 # Import the new NUT config module
 from core.nut_config import check_nut_config_files, is_nut_configured
@@ -163,21 +195,6 @@ from core.nut_config.api_nut_config import register_api_routes as register_nut_c
 # Import the new NUT daemon module for managing NUT services
 from core.nut import register_api_routes as register_nut_daemon_api_routes
 
-# Import the new NUT daemon module for managing NUT services
-from core.nut.nut_daemon import (
-    start_nut_services,
-    NUTConfigError,
-    NUTStartupError,
-    NUTShutdownError,
-    get_nut_mode
-)
-
-# Import nut_parser for NUT configuration file parsing
-from core.db.nut_parser import get_ups_connection_params, refresh_config
-
-# Import db_patch for database schema patching
-from core.db.db_patch import check_timestamp_columns
-
 # Check for NUT configuration files without exiting
 is_nut_configured, missing_nut_files = check_nut_config_files()
 
@@ -198,29 +215,28 @@ from werkzeug.serving import WSGIRequestHandler
 def check_database_and_tables():
     """Check if the database file exists and if the required tables are present"""
     logger.info("🔍 Checking if database exists and required tables are present...")
-    db_path = os.path.join(INSTANCE_PATH, DB_NAME)
     
     # Check if database file exists
-    if not os.path.exists(db_path):
-        logger.warning(f"❌ Database file does not exist: {db_path}")
+    db_stat = _stat_or_none(DB_PATH)
+    if db_stat is None:
+        logger.warning(f"❌ Database file does not exist: {DB_PATH}")
         return False
     
     # Check if database file is empty
-    if os.path.getsize(db_path) == 0:
-        logger.warning(f"❌ Database file is empty: {db_path}")
+    if db_stat.st_size == 0:
+        logger.warning(f"❌ Database file is empty: {DB_PATH}")
         return False
         
     # Check if required tables exist
     try:
-        # Use SQLAlchemy to check for required tables
-        from sqlalchemy import create_engine, inspect
-        
-        # Create a temporary engine
-        engine = create_engine(f'sqlite:///{db_path}')
-        inspector = inspect(engine)
+        # Reuse the boot-time read done by initialize_timezone
+        if _BOOT_DB_STATE is not None:
+            has_initial_setup_table = _BOOT_DB_STATE[1]
+        else:
+            _, has_initial_setup_table = _bootstrap_from_db(DB_PATH)
         
         # Check if the required table exists
-        if 'ups_initial_setup' not in inspector.get_table_names():
+        if not has_initial_setup_table:
             logger.warning("❌ Required table 'ups_initial_setup' does not exist")
             return False
             
@@ -247,20 +263,41 @@ if is_fully_configured:
 
 # Only import the rest of the components if fully configured
 if is_fully_configured:
+    from collections import deque
+    from sqlalchemy import inspect
+    
+    # Import the NUT daemon module for managing NUT services
+    from core.nut.nut_daemon import (
+        start_nut_services,
+        NUTConfigError,
+        NUTStartupError,
+        NUTShutdownError,
+        get_nut_mode,
+        get_ups_monitor_config,
+        test_ups_connection,
+        wait_for_ups_ready
+    )
+    
+    # Import nut_parser for NUT configuration file parsing
+    from core.db.nut_parser import get_ups_connection_params, refresh_config
+    
+    # Import db_patch for database schema patching
+    from core.db.db_patch import check_timestamp_columns
+    
+    # Engine options and PRAGMAs shared with core.create_app
+    from core.db import DB_POOL_SIZE, sqlite_engine_options, register_sqlite_pragmas
+    
     from core.db.ups import (
         db, configure_ups, save_ups_data, get_ups_data, get_ups_model, 
         data_lock, socketio as db_socketio, get_event_type, handle_ups_event, 
         UPSError, UPSConnectionError, UPSCommandError, UPSDataError, UPSData, 
-        UPSCommand, VariableConfig, ups_data_cache
+        UPSCommand, VariableConfig, ups_data_cache, get_polling_interval
     )
-    from core.db.initializer import init_database
     from core.routes import register_routes
-    from core.api import register_api_routes
+    from core.api import register_api_routes, OrjsonProvider
     from core.energy.api_energy import register_api_routes as register_energy_api_routes
     from core.battery.api_battery import register_api_routes as register_battery_api_routes
     from core.advanced.api_advanced import register_api_routes as register_advanced_api_routes
-    from core.mail import init_notification_settings
-    from core.mail.api_mail import register_mail_api_routes
     from core.settings.api_settings import api_settings
     from core.settings.routes_settings import routes_settings
     from core.logger import routes_logger, api_logger
@@ -269,7 +306,6 @@ if is_fully_configured:
     from core.scheduler import scheduler, register_scheduler_routes
     from core.logger.api_logger import api_logger
     from core.logger.routes_logger import routes_logger
-    from core.db.model_classes import register_models_for_global_access
     from core.options.api_options import api_options
     from core.options.routes_options import routes_options
 else:
@@ -324,29 +360,31 @@ Talisman(app,
     content_security_policy=None
 )
 
+# Cached (uid, gid) of the nut user, resolved once to avoid repeated NSS lookups
+_NUT_IDS = None
+
 # Define a function to ensure database permissions (only used when fully configured)
 def ensure_database_permissions():
     """Ensure the database file has proper permissions for the nut user"""
+    global _NUT_IDS
     try:
         logger.info("Checking database file permissions...")
-        # Get the database path
-        db_path = os.path.join(INSTANCE_PATH, DB_NAME)
-        
-        # Check if database file exists
-        if os.path.exists(db_path):
+        # Check if database file exists (the same stat result carries owner and mode)
+        stat_info = _stat_or_none(DB_PATH)
+        if stat_info is not None:
             # Get current owner and permissions if possible
             try:
                 import pwd
                 import grp
-                stat_info = os.stat(db_path)
                 uid = stat_info.st_uid
                 gid = stat_info.st_gid
                 mode = stat_info.st_mode
                 
                 # Try to get nut user and group IDs
                 try:
-                    nut_uid = pwd.getpwnam('nut').pw_uid
-                    nut_gid = grp.getgrnam('nut').gr_gid
+                    if _NUT_IDS is None:
+                        _NUT_IDS = (pwd.getpwnam('nut').pw_uid, grp.getgrnam('nut').gr_gid)
+                    nut_uid, nut_gid = _NUT_IDS
                     
                     # Log current permissions
                     logger.info(f"Database permissions - Current: uid={uid}, gid={gid}, mode={mode:o}")
@@ -354,21 +392,22 @@ def ensure_database_permissions():
                     
                     # Fix ownership and permissions if needed
                     if uid != nut_uid or gid != nut_gid:
-                        os.chown(db_path, nut_uid, nut_gid)
+                        os.chown(DB_PATH, nut_uid, nut_gid)
                         logger.info(f"Changed database ownership to nut:nut")
                     
                     # Fix permissions if needed (664 = rw-rw-r--)
                     if (mode & 0o777) != 0o664:
-                        os.chmod(db_path, 0o664)
+                        os.chmod(DB_PATH, 0o664)
                         logger.info(f"Changed database permissions to 664")
                     
-                    # Also check for SQLite journal files
-                    for ext in ["-journal", "-wal", "-shm"]:
-                        journal_file = f"{db_path}{ext}"
-                        if os.path.exists(journal_file):
-                            os.chown(journal_file, nut_uid, nut_gid)
-                            os.chmod(journal_file, 0o664)
-                            logger.info(f"Fixed permissions for {journal_file}")
+                    # Also check for SQLite journal files in a single directory pass
+                    journal_names = {f"{DB_NAME}{ext}" for ext in ("-journal", "-wal", "-shm")}
+                    with os.scandir(os.path.dirname(DB_PATH)) as entries:
+                        for entry in entries:
+                            if entry.name in journal_names:
+                                os.chown(entry.path, nut_uid, nut_gid)
+                                os.chmod(entry.path, 0o664)
+                                logger.info(f"Fixed permissions for {entry.path}")
                     
                 except (KeyError, PermissionError) as e:
                     # Couldn't get nut user or don't have permission to change
@@ -376,14 +415,14 @@ def ensure_database_permissions():
             except ImportError:
                 # pwd/grp modules not available (non-Unix OS), just try chmod
                 try:
-                    os.chmod(db_path, 0o664)
+                    os.chmod(DB_PATH, 0o664)
                     logger.info("Set database permissions to 664 (owner unchanged)")
                 except Exception as e:
                     logger.warning(f"Failed to set database permissions: {str(e)}")
         else:
-            logger.info(f"Database file doesn't exist yet at {db_path}")
+            logger.info(f"Database file doesn't exist yet at {DB_PATH}")
             # Ensure the directory has proper permissions
-            db_dir = os.path.dirname(db_path)
+            db_dir = os.path.dirname(DB_PATH)
             if not os.path.exists(db_dir):
                 os.makedirs(db_dir, exist_ok=True)
                 logger.info(f"Created database directory: {db_dir}")
@@ -403,8 +442,10 @@ if is_fully_configured:
     app.config['INSTANCE_PATH'] = INSTANCE_PATH
     app.config['SQLALCHEMY_DATABASE_URI'] = DB_URI
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = sqlite_engine_options(DB_POOL_SIZE)
     app.config['JSONIFY_PRETTYPRINT_REGULAR'] = True
     app.config['JSON_SORT_KEYS'] = False
+    app.json = OrjsonProvider(app)
     app.json.compact = False
 
     # Ensure database has proper permissions before initializing
@@ -413,6 +454,19 @@ if is_fully_configured:
     # Initialize database only once
     db.init_app(app)
     
+    # Warm the connection pool so the first poll and first request don't pay connect cost
+    with app.app_context():
+        # Apply SQLite PRAGMAs once per new DBAPI connection (before the pool is warmed)
+        register_sqlite_pragmas(db.engine)
+        
+        try:
+            conns = [db.engine.connect() for _ in range(DB_POOL_SIZE)]
+            for conn in conns:
+                conn.close()
+            logger.info(f"✅ Database connection pool warmed with {DB_POOL_SIZE} connections")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not warm database connection pool: {str(e)}")
+    
     # Process NUT configuration first
     with app.app_context():
         # Configure UPS
@@ -454,14 +508,16 @@ if is_fully_configured:
     register_battery_api_routes(app)
     register_advanced_api_routes(app)
     register_scheduler_routes(app)
-    register_blueprint_if_not_exists(app, api_logger)
-    register_blueprint_if_not_exists(app, routes_logger)
-    register_blueprint_if_not_exists(app, api_settings)
-    register_blueprint_if_not_exists(app, routes_settings)
-    register_blueprint_if_not_exists(app, api_upsmon)
-    register_blueprint_if_not_exists(app, routes_upsmon)
-    register_blueprint_if_not_exists(app, api_options)
-    register_blueprint_if_not_exists(app, routes_options)
+    
+    # Register the plain blueprints in one pass; werkzeug marks the URL map for
+    # remapping on each add and rebuilds it only once, on first match
+    for blueprint in (
+        api_logger, routes_logger,
+        api_settings, routes_settings,
+        api_upsmon, routes_upsmon,
+        api_options, routes_options,
+    ):
+        register_blueprint_if_not_exists(app, blueprint)
 else:
     # Minimal configuration for setup mode
     socketio.init_app(app, 
@@ -529,16 +585,46 @@ if not use_werkzeug:
 def isoformat_filter(value):
     """Converts a datetime object to ISO string with timezone"""
     if isinstance(value, datetime.datetime):
-        if value.tzinfo is None:
-            value = CACHE_TIMEZONE.localize(value)
+        tz = value.tzinfo
+        if tz is None:
+            # A freshly localized value is already in CACHE_TIMEZONE
+            return CACHE_TIMEZONE.localize(value).isoformat()
+        if getattr(tz, 'zone', None) == CACHE_TIMEZONE.zone:
+            return value.isoformat()
         return value.astimezone(CACHE_TIMEZONE).isoformat()
     return value
 
 # Only define and start the polling thread if NUT is configured
 if is_fully_configured:
-    # Data buffer
+    # Data buffer - no lock needed: deque.append/popleft are atomic under the GIL and
+    # never yield to other green threads; take snapshots with tuple(data_buffer)
     data_buffer = deque(maxlen=60)
-    buffer_lock = threading.Lock()
+    
+    # Backoff seconds indexed by consecutive failures (saturates at 300s)
+    _BACKOFF = (1, 2, 4, 8, 16, 32, 64, 128, 256, 300)
+
+    def polling_tick(connection_monitor):
+        """
+        Run a single UPS polling cycle
+        
+        Args:
+            connection_monitor: The UPS connection monitor from core.db.internal_checker
+            
+        Returns:
+            bool or None: Whether the data was saved, None if the cycle was skipped
+        """
+        with app.app_context():
+            # Check if connection is available before polling
+            if not connection_monitor.is_connected():
+                # If disconnected, skip polling and wait for recovery
+                recovery_status = connection_monitor.get_recovery_status()
+                logger.warning("⚠️ UPS connection unavailable: %s. Skipping polling cycle.", recovery_status)
+                return None
+            
+            # Get the UPSDynamicData model
+            UPSDynamicData = get_ups_model(db)
+            success, error = save_ups_data(db, UPSDynamicData, ups_data_cache)
+            return success
 
     def polling_thread():
         """Thread for UPS data polling"""
@@ -553,68 +639,24 @@ if is_fully_configured:
         
         while True:
             try:
+                success = polling_tick(connection_monitor)
+                if success is not None:
+                    failures = 0 if success else failures + 1
+                
+                # Get polling interval from VariableConfig (cached, clamped to 1-60 seconds)
                 with app.app_context():
-                    # Check if connection is available before polling
-                    if not connection_monitor.is_connected():
-                        # If disconnected, skip polling and wait for recovery
-                        recovery_status = connection_monitor.get_recovery_status()
-                        logger.warning(f"⚠️ UPS connection unavailable: {recovery_status}. Skipping polling cycle.")
-                        
-                        # Get polling interval (used for sleep time)
-                        try:
-                            if hasattr(db, 'ModelClasses') and hasattr(db.ModelClasses, 'VariableConfig'):
-                                model_class = db.ModelClasses.VariableConfig
-                            else:
-                                from core.db.ups import VariableConfig
-                                model_class = VariableConfig
-                            
-                            config = model_class.query.first()
-                            polling_interval = config.polling_interval if config else 1
-                        except Exception as e:
-                            logger.error(f"Error getting polling interval: {str(e)}. Using default of 1 second.")
-                            polling_interval = 1
-                        
-                        # Ensure polling_interval is within 1-60 seconds
-                        polling_interval = max(1, min(60, polling_interval))
-                        time.sleep(polling_interval)
-                        continue
-                    
-                    # Get the UPSDynamicData model
-                    UPSDynamicData = get_ups_model(db)
-                    success, error = save_ups_data(db, UPSDynamicData, ups_data_cache)
-                    
-                    if not success:
-                        failures += 1
-                    else:
-                        failures = 0
-                    
-                    # Get polling interval from VariableConfig (defaults to 1 second if not available)
-                    try:
-                        if hasattr(db, 'ModelClasses') and hasattr(db.ModelClasses, 'VariableConfig'):
-                            model_class = db.ModelClasses.VariableConfig
-                        else:
-                            from core.db.ups import VariableConfig
-                            model_class = VariableConfig
-                        
-                        config = model_class.query.first()
-                        polling_interval = config.polling_interval if config else 1
-                    except Exception as e:
-                        logger.error(f"Error getting polling interval: {str(e)}. Using default of 1 second.")
-                        polling_interval = 1
-                    
-                    # Ensure polling_interval is within 1-60 seconds
-                    polling_interval = max(1, min(60, polling_interval))
-                    time.sleep(polling_interval)
+                    polling_interval = get_polling_interval(db)
+                time.sleep(polling_interval)
                     
             except (UPSConnectionError, UPSCommandError, UPSDataError) as e:
                 failures += 1
-                sleep_time = min(300, 2 ** failures)
-                logger.warning(f"Polling error: {str(e)}. Backing off for {sleep_time}s")
+                sleep_time = _BACKOFF[min(failures, 9)]
+                logger.warning("Polling error: %s. Backing off for %ss", e, sleep_time)
                 time.sleep(sleep_time)
             except Exception as e:
-                logger.error(f"Unexpected error in polling thread: {str(e)}")
+                logger.error("Unexpected error in polling thread: %s", e)
                 failures += 1
-                time.sleep(min(300, 2 ** failures))
+                time.sleep(_BACKOFF[min(failures, 9)])
 
 # Disables Werkzeug log if LOG_LEVEL is OFF
 if LOG_LEVEL == 'OFF':
@@ -637,44 +679,45 @@ def init_app():
                 return
             
             # ======== INITIALIZE APPLICATION TIMEZONE ========
-            logger.info("")
-            logger.info("=" * 60)
-            logger.info("=====        INITIALIZING APPLICATION TIMEZONE         =====")
-            logger.info("=" * 60)
-            
-            # Use the global CACHE_TIMEZONE that was initialized at startup
-            logger.info(f"🕒 Application display timezone: {CACHE_TIMEZONE.zone}")
-            logger.info(f"🕒 Database timezone: UTC (fixed)")
-            logger.info("=" * 60)
-            
-            # Small delay to ensure logs are displayed in order
-            time.sleep(0.5)
+            # Each banner is emitted as a single multi-line record so it stays in order
+            logger.info("\n".join([
+                "",
+                "=" * 60,
+                "=====        INITIALIZING APPLICATION TIMEZONE         =====",
+                "=" * 60,
+                # Use the global CACHE_TIMEZONE that was initialized at startup
+                f"🕒 Application display timezone: {CACHE_TIMEZONE.zone}",
+                "🕒 Database timezone: UTC (fixed)",
+                "=" * 60,
+            ]))
             
             # ======== STEP 1: ATTEMPT TO START NUT SERVICES ========
-            logger.info("")
-            logger.info("=" * 60)
-            logger.info("=====              STARTING NUT SERVICES               =====")
-            logger.info("=" * 60)
+            logger.info("\n".join([
+                "",
+                "=" * 60,
+                "=====              STARTING NUT SERVICES               =====",
+                "=" * 60,
+            ]))
             
             try:
                 # Get NUT mode before starting services
                 nut_mode = get_nut_mode()
-                logger.info(f"🔍 Detected NUT mode: {nut_mode}")
                 
                 # Log which services will be started based on mode
+                banner = [f"🔍 Detected NUT mode: {nut_mode}"]
                 if nut_mode == 'netclient':
-                    logger.info("📡 Operating in NETCLIENT mode - will connect to a remote NUT server")
-                    logger.info("🔧 Services that will be started: upsmon (monitor only)")
+                    banner.append("📡 Operating in NETCLIENT mode - will connect to a remote NUT server")
+                    banner.append("🔧 Services that will be started: upsmon (monitor only)")
                 elif nut_mode == 'standalone':
-                    logger.info("💻 Operating in STANDALONE mode - UPS connected to this machine")
-                    logger.info("🔧 Services that will be started: upsdrvctl (drivers), upsd (server), upsmon (monitor)")
+                    banner.append("💻 Operating in STANDALONE mode - UPS connected to this machine")
+                    banner.append("🔧 Services that will be started: upsdrvctl (drivers), upsd (server), upsmon (monitor)")
                 elif nut_mode == 'netserver':
-                    logger.info("🖥️ Operating in NETSERVER mode - serving UPS data to network clients")
-                    logger.info("🔧 Services that will be started: upsdrvctl (drivers), upsd (server), upsmon (monitor)")
+                    banner.append("🖥️ Operating in NETSERVER mode - serving UPS data to network clients")
+                    banner.append("🔧 Services that will be started: upsdrvctl (drivers), upsd (server), upsmon (monitor)")
                 else:
-                    logger.info(f"⚠️ Unknown NUT mode: {nut_mode}")
-                
-                logger.info("🚀 Starting NUT services (this may take several seconds)...")
+                    banner.append(f"⚠️ Unknown NUT mode: {nut_mode}")
+                banner.append("🚀 Starting NUT services (this may take several seconds)...")
+                logger.info("\n".join(banner))
                 
                 # This is now the single check for NUT availability
                 start_results = start_nut_services(wait_time=2)
@@ -699,7 +742,6 @@ def init_app():
                     if nut_mode == 'netclient' and 'upsmon' in failed_services:
                         # In netclient mode, let's test if upsc works directly
                         logger.info("In netclient mode, testing if upsc works directly even though upsmon failed...")
-                        from core.nut.nut_daemon import get_ups_monitor_config, test_ups_connection
                         ups_name, ups_host = get_ups_monitor_config()
                         
                         if ups_name and ups_host:
@@ -739,9 +781,13 @@ def init_app():
                 
                 logger.info("✅ Required NUT services started successfully")
                 
-                # Add a delay to ensure NUT services are fully started before database initialization
+                # Wait until the UPS actually answers (bounded) before database initialization
                 logger.info("🕒 Waiting for NUT services to fully initialize...")
-                time.sleep(5)
+                ups_name, ups_host = get_ups_monitor_config()
+                if ups_name and ups_host and wait_for_ups_ready(ups_name, ups_host, timeout=5):
+                    logger.info(f"✅ UPS {ups_name}@{ups_host} is answering")
+                else:
+                    logger.warning("⚠️ UPS not answering yet after 5s, continuing anyway")
                 
             except NUTConfigError as e:
                 logger.warning(f"⚠️ NUT configuration error: {str(e)}")
@@ -762,26 +808,25 @@ def init_app():
             logger.info("=====             DATABASE INITIALIZATION             =====")
             logger.info("=" * 60)
             
-            # Import db here to ensure it's only used when NUT is configured
-            from core.db.ups import db
+            # Imported only once NUT services are up, after the critical-failure returns
             from core.db.initializer import init_database
             from core.db.model_classes import register_models_for_global_access
             
             # Check if database file exists, if not or if it's empty, recreate it
-            db_path = os.path.join(INSTANCE_PATH, DB_NAME)
-            db_needs_init = not os.path.exists(db_path) or os.path.getsize(db_path) == 0
+            db_stat = _stat_or_none(DB_PATH)
+            db_existed = db_stat is not None and db_stat.st_size > 0
+            db_needs_init = not db_existed
             
             if db_needs_init:
                 logger.info("🔄 Database file not found or empty. Creating new database...")
             else:
-                logger.info("🔍 Checking database integrity...")
+                logger.info(f"🔍 Checking database integrity ({db_stat.st_size} bytes)...")
                 try:
                     # Check if tables exist by doing a simple query
                     with db.engine.connect() as conn:
-                        # Use Inspector to check if the table exists - pure ORM approach
-                        inspector = inspect(db.engine)
-                        tables_check = 'ups_variables_upscmd' in inspector.get_table_names()
-                        if not tables_check:
+                        # Use Inspector on the open connection to check if the table exists
+                        inspector = inspect(conn)
+                        if not inspector.has_table('ups_variables_upscmd'):
                             logger.warning("⚠️ Required tables missing in database. Recreating...")
                             db_needs_init = True
                 except Exception as e:
@@ -791,7 +836,8 @@ def init_app():
             # Initialize or reinitialize database if needed
             if db_needs_init:
                 logger.info("🔄 (Re)initializing database...")
-                db.drop_all()  # Remove any partial tables if they exist
+                if db_existed:
+                    db.drop_all()  # Remove any partial tables if they exist
                 db.create_all()  # Create all tables from scratch
             
             db_init_success = init_database(app, db)
@@ -823,7 +869,7 @@ def init_app():
                     if timezone_str and CACHE_TIMEZONE.zone != timezone_str:
                         logger.info(f"🕒 Updating CACHE_TIMEZONE from database: {timezone_str}")
                         # Update the global variable
-                        CACHE_TIMEZONE = pytz.timezone(timezone_str)
+                        CACHE_TIMEZONE = _tz(timezone_str)
                         # Update app attribute too
                         app.CACHE_TIMEZONE = CACHE_TIMEZONE
                         logger.info(f"🕒 CACHE_TIMEZONE updated to: {CACHE_TIMEZONE.zone}")
@@ -858,9 +904,6 @@ def init_app():
                 logger.warning("⚠️ Authentication features may not work properly")
             
             logger.info("=" * 60)
-            
-            # Small delay to ensure logs are displayed in order
-            time.sleep(0.5)
                 
             # ======== STEP 3: INITIALIZE APPLICATION SERVICES ========
             logger.info("")
@@ -869,12 +912,28 @@ def init_app():
             logger.info("=====            APPLICATION SERVICES PHASE           =====")
             logger.info("=" * 60)
             
-            # Explicitly load the encryption key first for mail and other components that need it
+            # The encryption key, mail/Ntfy model lookups and the webhook config load are
+            # independent of each other, so run them side by side; blueprints are still
+            # registered on this thread since Flask's url_map isn't thread-safe.
+            # load_webhook_configurations() resolves the Webhook model itself.
+            from concurrent.futures import ThreadPoolExecutor
+            from core.mail import load_encryption_key, init_mail_models
+            from core.extranotifs.ntfy import get_ntfy_model
+            from core.extranotifs.webhook import load_webhook_configurations
+            
+            def _with_app_context(func):
+                with app.app_context():
+                    return func()
+            
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                key_future, mail_future, ntfy_future, webhook_configs_future = [
+                    executor.submit(_with_app_context, func)
+                    for func in (load_encryption_key, init_mail_models, get_ntfy_model,
+                                 load_webhook_configurations)
+                ]
+            
             try:
-                from core.mail import load_encryption_key
-                
-                # Try loading the encryption key now that app is fully initialized
-                if load_encryption_key():
+                if key_future.result():
                     logger.info("✅ Secret key loaded successfully for encryption")
                 else:
                     logger.warning("⚠️ SECRET_KEY not found in environment - encryption features will be DISABLED")
@@ -883,11 +942,8 @@ def init_app():
                 logger.error(f"❌ Error loading encryption key: {str(key_error)}")
                 logger.warning("⚠️ Encryption features will be DISABLED")
 
-            # Initialize mail models explicitly after database initialization is complete
             logger.info("📧 Initializing mail models...")
-            from core.mail import init_mail_models
-            mail_models_initialized = init_mail_models()
-            if mail_models_initialized:
+            if mail_future.result():
                 logger.info("✅ Mail models initialized successfully")
             else:
                 logger.warning("⚠️ Failed to initialize mail models - notifications may not work properly")
@@ -896,23 +952,15 @@ def init_app():
             # are initialized during database initialization in initializer.py
             logger.info("📧 Mail and notification systems ready")
             
-            # Initialize Ntfy model
             logger.info("📱 Initializing Ntfy module...")
-            from core.extranotifs.ntfy import get_ntfy_model
-            # Get the NtfyConfig model from db.ModelClasses
-            get_ntfy_model()
+            ntfy_future.result()
             
             # Register Ntfy blueprint
             from core.extranotifs.ntfy.routes import create_blueprint
             ntfy_bp = create_blueprint()
             app.register_blueprint(ntfy_bp)
             
-            # Initialize Webhook model
             logger.info("🌐 Initializing Webhook module...")
-            from core.extranotifs.webhook import get_webhook_model
-            # Get the WebhookConfig model from db.ModelClasses
-            get_webhook_model()
-            
             # Register Webhook blueprint
             try:
                 from core.extranotifs.webhook.routes import create_blueprint
@@ -920,9 +968,8 @@ def init_app():
                 app.register_blueprint(webhook_bp)
                 logger.info("✅ Webhook blueprint registered successfully")
                 
-                # Explicitly load webhook configurations to ensure persistence
-                from core.extranotifs.webhook import load_webhook_configurations
-                if load_webhook_configurations():
+                # Webhook configurations were loaded above to ensure persistence
+                if webhook_configs_future.result():
                     logger.info("✅ Webhook configurations loaded successfully")
                 else:
                     logger.warning("⚠️ No webhook configurations found or failed to load")
@@ -947,9 +994,6 @@ def init_app():
             logger.info("✅ Application services initialized successfully")
             logger.info("=" * 60)
             
-            # Small delay to ensure logs are displayed in order
-            time.sleep(0.5)
-            
             # ======== STEP 4: START UPS DATA POLLING ========
             logger.info("")
             logger.info("=" * 60)
@@ -966,8 +1010,10 @@ def init_app():
             
             # Start polling thread
             logger.info("🔄 Starting UPS data polling thread...")
-            thread = threading.Thread(target=polling_thread, daemon=True)
-            thread.start()
+            # Spawn directly on the eventlet hub rather than through the patched threading
+            # shim; a native OS thread can't be used because save_ups_data broadcasts
+            # through the eventlet-bound socketio and shares the green-locked DB pool
+            socketio.start_background_task(polling_thread)
             
             logger.info("✅ Scheduler initialized successfully")
             logger.info("=" * 60)
@@ -985,51 +1031,32 @@ if __name__ == '__main__':
     # Configure SSL context if enabled
     ssl_context = None
     if SSL_ENABLED:
-        if os.path.exists(SSL_CERT) and os.path.exists(SSL_KEY):
+        if _readable(SSL_CERT) and _readable(SSL_KEY):
             logger.info(f"🔒 SSL enabled with certificate: {SSL_CERT}")
             ssl_context = (SSL_CERT, SSL_KEY)
             
-            # Create a wsgi.py file for gunicorn
-            wsgi_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'wsgi.py')
-            with open(wsgi_path, 'w') as f:
-                f.write("""
-import os
-import sys
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from app import app, socketio, init_app
-
-# Initialize the application when running with gunicorn
-init_app()
-
-if __name__ == '__main__':
-    socketio.run(app)
-""")
-            
-            # Start with gunicorn for SSL support
-            import subprocess
+            # Start with gunicorn for SSL support (the app is loaded from the shipped wsgi.py).
+            # Keep a single worker: every worker would run its own polling loop and scheduler,
+            # and Socket.IO sessions live in process memory
             logger.info("Starting application with SSL via gunicorn")
             cmd = [
                 "gunicorn", 
                 "--worker-class", "eventlet", 
                 "-w", "1", 
+                "--reuse-port",
+                "-c", "gunicorn_conf.py",
                 "--certfile", SSL_CERT, 
                 "--keyfile", SSL_KEY,
                 "-b", f"{SERVER_HOST}:{SERVER_PORT}", 
                 "wsgi:app"
             ]
             logger.info(f"Starting gunicorn with SSL: {' '.join(cmd)}")
-            subprocess.Popen(cmd, cwd=os.path.dirname(os.path.abspath(__file__)))
             
-            # Keep the main process running to handle signals
-            import time
-            try:
-                while True:
-                    time.sleep(1)
-            except KeyboardInterrupt:
-                logger.info("Shutting down...")
-                sys.exit(0)
+            # Replace this process with gunicorn so signals reach it directly
+            os.chdir(os.path.dirname(os.path.abspath(__file__)))
+            os.execvp(cmd[0], cmd)
         else:
-            logger.warning(f"⚠️ SSL certificates not found at {SSL_CERT} and {SSL_KEY}. Running without SSL.")
+            logger.warning(f"⚠️ SSL certificates not found or empty at {SSL_CERT} and {SSL_KEY}. Running without SSL.")
             ssl_context = None
             # Initialize without SSL since we're not using gunicorn
             init_app()
@@ -23,6 +23,7 @@ from .settings import DB_URI, LOG_FILE, LOG_LEVEL_DEBUG, LOG_LEVEL_INFO
 from core.logger import system_logger as logger
 from .scheduler import scheduler
 from .db.initializer import init_database
+from .db import DB_POOL_SIZE, sqlite_engine_options, register_sqlite_pragmas
 from core.report import report_manager, api_report, routes_report
 from core.options import api_options, routes_options
 logger.info("🏁 Initializating init")
@@ -68,6 +69,9 @@ def create_app(config=None):
     app.config['SQLALCHEMY_DATABASE_URI'] = DB_URI
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     
+    # Same per-thread pool as the main app: sessions on different threads must not share a connection
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = sqlite_engine_options(DB_POOL_SIZE)
+    
     # Initialize database only
     db.init_app(app)
     
@@ -82,15 +86,23 @@ def create_app(config=None):
         logger.info(f"✅ Set app.CACHE_TIMEZONE from global module: {CACHE_TIMEZONE.zone}")
     except (ImportError, AttributeError) as e:
         import pytz
-        app.CACHE_TIMEZONE = pytz.timezone('UTC')
+        app.CACHE_TIMEZONE = pytz.UTC
         logger.warning(f"⚠️ Failed to get CACHE_TIMEZONE from app module: {str(e)}. Using UTC instead.")
     
     # Don't initialize scheduler here - we'll do it later
     # in a controlled sequence after database initialization
     
     with app.app_context():
+        # PRAGMAs must be in place before create_all opens the first connection
+        register_sqlite_pragmas(db.engine)
+        
         # Create tables but don't initialize services yet
         db.create_all()
+        
+        # Open one connection now so the first real query doesn't pay the connect cost
+        from sqlalchemy import text
+        with db.engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
     
     # Register mail and report managers
     report_manager.init_app(app)
@@ -6,6 +6,13 @@ Provides functions to read and write NUT configuration files and restart NUT ser
 import os
 import subprocess
 import re
+import shlex
+import sys
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from stat import S_ISDIR
+from types import MappingProxyType
 from typing import Dict, List, Tuple, Any, Optional
 import shutil
 from core.logger import system_logger as logger
@@ -29,7 +36,9 @@ from core.settings import (
     NUT_STOP_MONITOR_CMD,
     NUT_RUN_DIR,
     NUT_LOG_DIR,
-    NUT_STATE_DIR
+    NUT_STATE_DIR,
+    NUT_UPSD_PID,
+    NUT_UPSMON_PID
 )
 import time
 
@@ -120,6 +129,102 @@ NUT_FILES = {
     }
 }
 
+# NUT_FILES is reference data: intern the filenames (they are looked up on every
+# request) and expose it read-only so no caller can alter it
+NUT_FILES = MappingProxyType({sys.intern(name): meta for name, meta in NUT_FILES.items()})
+
+# Flat (description, documentation) index of NUT_FILES, built once at import
+_NUT_INDEX = {
+    name: (meta.get("description", ""), meta.get("documentation", {}))
+    for name, meta in NUT_FILES.items()
+}
+_NO_NUT_ENTRY = ("", {})
+_NUT_FILENAMES = frozenset(NUT_FILES)
+# Full paths of the known NUT files, joined once
+_NUT_PATHS = {name: os.path.join(NUT_CONFIG_DIR, name) for name in NUT_FILES}
+
+# Cached get_available_nut_files() result, validated by directory mtime and a short TTL.
+# In-place edits don't touch the directory mtime, so writers reset "mtime" explicitly.
+LISTING_CACHE_TTL = 5.0
+_LISTING_CACHE = {"mtime": None, "value": None, "ts": 0.0}
+
+# Known NUT filenames last seen missing, mapped to the directory st_mtime_ns at that
+# time; creating the file changes the directory mtime, which invalidates the entry
+_NEG_CACHE: Dict[str, int] = {}
+
+def _command_argv(cmd: str):
+    """
+    Split a configured NUT command into an argv list so it can run without a
+    shell; commands that rely on shell syntax are returned unchanged.
+    """
+    if any(ch in cmd for ch in '|&;<>$`'):
+        return cmd
+    return shlex.split(cmd)
+
+# NUT service commands, split once at import
+_STOP_ARGVS = tuple(_command_argv(cmd) for cmd in (NUT_STOP_MONITOR_CMD, NUT_STOP_SERVER_CMD, NUT_STOP_DRIVER_CMD))
+_START_DRIVER_ARGV = _command_argv(NUT_START_DRIVER_CMD)
+_START_SERVER_ARGV = _command_argv(NUT_START_SERVER_CMD)
+_START_MONITOR_ARGV = _command_argv(NUT_START_MONITOR_CMD)
+
+# PID file locations used to tell when upsd/upsmon have started or exited
+# (same candidates as core.nut.nut_daemon.check_service_status)
+_UPSD_PID_PATHS = (
+    os.path.join(NUT_RUN_DIR, NUT_UPSD_PID),
+    os.path.join(NUT_STATE_DIR, NUT_UPSD_PID)
+)
+_UPSMON_PID_PATHS = (
+    os.path.join('/run', NUT_UPSMON_PID),
+    os.path.join('/var/run', NUT_UPSMON_PID),
+    os.path.join(NUT_RUN_DIR, NUT_UPSMON_PID),
+    os.path.join(NUT_STATE_DIR, NUT_UPSMON_PID)
+)
+
+def _ensure_dir(path: str, mode: int = 0o755) -> None:
+    """Create path with the given mode, or fix its mode, only when needed (one stat in the common case)"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        os.makedirs(path, mode=mode, exist_ok=True)
+        os.chmod(path, mode)  # makedirs' mode is filtered by the umask
+        return
+    if not S_ISDIR(st.st_mode):
+        raise NotADirectoryError(f"{path} exists and is not a directory")
+    if (st.st_mode & 0o777) != mode:
+        os.chmod(path, mode)
+
+# Small persistent pool for the post-restart verification checks
+_VERIFY_POOL = ThreadPoolExecutor(max_workers=3, thread_name_prefix='nut-verify')
+
+@functools.lru_cache(maxsize=64)
+def _format_mtime(mtime_ns: int) -> str:
+    """ISO-format a file mtime; cached since NUT config files rarely change"""
+    return datetime.fromtimestamp(mtime_ns / 1e9).isoformat()
+
+def _any_exists(paths) -> bool:
+    return any(os.path.exists(path) for path in paths)
+
+def _wait_for(predicate, timeout: float, initial: float = 0.05) -> bool:
+    """
+    Poll predicate with a growing delay (capped at 0.5s) until it returns True
+    or the timeout expires.
+    
+    Returns:
+        bool: True if the predicate became true within the timeout
+    """
+    deadline = time.monotonic() + timeout
+    delay = initial
+    while not predicate():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 1.6, 0.5)
+    return True
+
+# MODE=<value> line in nut.conf (optionally quoted)
+_MODE_RE = re.compile(r'^\s*MODE\s*=\s*["\']?([^"\'\s#]+)', re.MULTILINE)
+
 def get_available_nut_files() -> List[Dict[str, Any]]:
     """
     Get a list of available NUT configuration files.
@@ -132,33 +237,41 @@ def get_available_nut_files() -> List[Dict[str, Any]]:
         - modified: Last modification time (ISO format)
         - description: Description of the file's purpose
     """
-    available_files = []
+    try:
+        dir_mtime = os.stat(NUT_CONFIG_DIR).st_mtime_ns
+    except OSError:
+        dir_mtime = None
     
-    # Check if the NUT directory exists
-    if not os.path.exists(NUT_CONFIG_DIR):
-        logger.warning(f"NUT configuration directory {NUT_CONFIG_DIR} does not exist")
-        return available_files
+    if (dir_mtime is not None and dir_mtime == _LISTING_CACHE["mtime"]
+            and time.monotonic() - _LISTING_CACHE["ts"] < LISTING_CACHE_TTL):
+        return _LISTING_CACHE["value"]
+    
+    available_files = []
     
-    # Get list of files in the NUT directory
+    # Single scandir pass: one directory read, one (cached) stat per known file
+    known_names = _NUT_FILENAMES
     try:
-        files = os.listdir(NUT_CONFIG_DIR)
-        
-        # Filter for known NUT configuration files
-        for filename in files:
-            if filename in NUT_FILES:
-                file_path = os.path.join(NUT_CONFIG_DIR, filename)
-                stat = os.stat(file_path)
+        with os.scandir(NUT_CONFIG_DIR) as entries:
+            for entry in entries:
+                # Filter for known NUT configuration files
+                if entry.name not in known_names:
+                    continue
+                stat = entry.stat()
                 
                 available_files.append({
-                    "name": filename,
-                    "path": file_path,
+                    "name": entry.name,
+                    "path": entry.path,
                     "size": stat.st_size,
-                    "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                    "description": NUT_FILES.get(filename, {}).get("description", "")
+                    "modified": _format_mtime(stat.st_mtime_ns),
+                    "description": _NUT_INDEX[entry.name][0]
                 })
+    except FileNotFoundError:
+        logger.warning(f"NUT configuration directory {NUT_CONFIG_DIR} does not exist")
     except Exception as e:
         logger.error(f"Error reading NUT configuration directory: {str(e)}")
+        return available_files
     
+    _LISTING_CACHE.update(mtime=dir_mtime, value=available_files, ts=time.monotonic())
     return available_files
 
 def get_nut_file_documentation(filename: str) -> Dict[str, str]:
@@ -173,11 +286,9 @@ def get_nut_file_documentation(filename: str) -> Dict[str, str]:
         filename: Name of the NUT configuration file (e.g., "nut.conf")
         
     Returns:
-        Dictionary with parameter documentation
+        Dictionary with parameter documentation (shared, callers must not mutate it)
     """
-    if filename in NUT_FILES:
-        return NUT_FILES[filename].get("documentation", {})
-    return {}
+    return _NUT_INDEX.get(filename, _NO_NUT_ENTRY)[1]
 
 def read_nut_config_file(filename: str) -> Dict[str, Any]:
     """
@@ -200,25 +311,25 @@ def read_nut_config_file(filename: str) -> Dict[str, Any]:
         - documentation: Dictionary with parameter documentation
         - message: Error message (if success is False)
     """
-    file_path = os.path.join(NUT_CONFIG_DIR, filename)
+    file_path = _NUT_PATHS.get(filename) or os.path.join(NUT_CONFIG_DIR, filename)
     
-    # Check if the file exists
-    if not os.path.exists(file_path):
-        logger.error(f"NUT configuration file {file_path} does not exist")
-        return {
-            "success": False,
-            "message": f"Configuration file {filename} does not exist",
-            "content": "",
-            "documentation": get_nut_file_documentation(filename)
-        }
+    try:
+        dir_mtime = os.stat(NUT_CONFIG_DIR).st_mtime_ns
+    except OSError:
+        dir_mtime = None
     
-    # Read the file content
+    # Skip the open entirely if the file was already missing and the directory
+    # hasn't changed since
+    if dir_mtime is not None and _NEG_CACHE.get(filename) == dir_mtime:
+        return _missing_nut_file_response(filename, file_path)
+    
+    # Read the file content; open() doubles as the existence check and the
+    # metadata comes from fstat on the open descriptor
     try:
-        with open(file_path, 'r') as f:
-            content = f.read()
-        
-        # Get file metadata
-        stat = os.stat(file_path)
+        # Read raw bytes and decode once, skipping the text-layer buffering
+        with open(file_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            content = f.read().decode('utf-8')
         
         return {
             "success": True,
@@ -226,10 +337,14 @@ def read_nut_config_file(filename: str) -> Dict[str, Any]:
             "path": file_path,
             "content": content,
             "size": stat.st_size,
-            "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+            "modified": _format_mtime(stat.st_mtime_ns),
             "documentation": get_nut_file_documentation(filename),
-            "description": NUT_FILES.get(filename, {}).get("description", "")
+            "description": _NUT_INDEX.get(filename, _NO_NUT_ENTRY)[0]
         }
+    except FileNotFoundError:
+        if dir_mtime is not None and filename in _NUT_INDEX:
+            _NEG_CACHE[filename] = dir_mtime
+        return _missing_nut_file_response(filename, file_path)
     except Exception as e:
         logger.error(f"Error reading NUT configuration file {file_path}: {str(e)}")
         return {
@@ -239,6 +354,16 @@ def read_nut_config_file(filename: str) -> Dict[str, Any]:
             "documentation": get_nut_file_documentation(filename)
         }
 
+def _missing_nut_file_response(filename: str, file_path: str) -> Dict[str, Any]:
+    """Build the read_nut_config_file payload for a file that does not exist"""
+    logger.error(f"NUT configuration file {file_path} does not exist")
+    return {
+        "success": False,
+        "message": f"Configuration file {filename} does not exist",
+        "content": "",
+        "documentation": get_nut_file_documentation(filename)
+    }
+
 def write_nut_config_file(filename: str, content: str) -> Dict[str, Any]:
     """
     Write content to a NUT configuration file.
@@ -256,20 +381,31 @@ def write_nut_config_file(filename: str, content: str) -> Dict[str, Any]:
         - message: Success or error message
         - backup: Path to the backup file (if successful)
     """
-    file_path = os.path.join(NUT_CONFIG_DIR, filename)
+    file_path = _NUT_PATHS.get(filename) or os.path.join(NUT_CONFIG_DIR, filename)
     backup_path = f"{file_path}.bak"
+    tmp_path = f"{file_path}.tmp"
     
     # Check if the file exists
-    if not os.path.exists(file_path):
+    try:
+        orig_stat = os.stat(file_path)
+    except FileNotFoundError:
         logger.error(f"NUT configuration file {file_path} does not exist")
         return {
             "success": False,
             "message": f"Configuration file {filename} does not exist"
         }
     
-    # Create a backup of the file
+    # Create a backup of the file: a hard link keeps the current inode as the
+    # backup without copying any bytes (copy only if linking isn't supported)
     try:
-        shutil.copy2(file_path, backup_path)
+        try:
+            os.unlink(backup_path)
+        except FileNotFoundError:
+            pass
+        try:
+            os.link(file_path, backup_path)
+        except OSError:
+            shutil.copy2(file_path, backup_path)
         logger.info(f"Created backup of {file_path} at {backup_path}")
     except Exception as e:
         logger.error(f"Error creating backup of {file_path}: {str(e)}")
@@ -278,12 +414,28 @@ def write_nut_config_file(filename: str, content: str) -> Dict[str, Any]:
             "message": f"Error creating backup: {str(e)}"
         }
     
-    # Write the file content
+    # Write the new content to a temp file with the original's mode and owner,
+    # then rename it over the original so the file is never left half-written
     try:
-        with open(file_path, 'w') as f:
-            f.write(content)
+        data = memoryview(content.encode('utf-8'))
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC,
+                     orig_stat.st_mode & 0o7777)
+        try:
+            try:
+                os.fchown(fd, orig_stat.st_uid, orig_stat.st_gid)
+            except OSError:
+                pass
+            os.fchmod(fd, orig_stat.st_mode & 0o7777)
+            while data:
+                data = data[os.write(fd, data):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, file_path)
         
         logger.info(f"Successfully wrote {file_path}")
+        _LISTING_CACHE["mtime"] = None
+        _NEG_CACHE.pop(filename, None)
         return {
             "success": True,
             "message": f"Successfully updated {filename}",
@@ -292,51 +444,73 @@ def write_nut_config_file(filename: str, content: str) -> Dict[str, Any]:
     except Exception as e:
         logger.error(f"Error writing NUT configuration file {file_path}: {str(e)}")
         
-        # Try to restore from backup
+        # The original is untouched until the rename, so only the temp file needs cleaning up
         try:
-            shutil.copy2(backup_path, file_path)
-            logger.info(f"Restored {file_path} from backup after write error")
-        except Exception as restore_error:
-            logger.error(f"Error restoring {file_path} from backup: {str(restore_error)}")
+            os.unlink(tmp_path)
+        except OSError:
+            pass
         
         return {
             "success": False,
             "message": f"Error writing configuration file: {str(e)}"
         }
 
+# Only one restart may run at a time; a request arriving just after one finished
+# gets that result instead of starting another full stop/start cycle
+RESTART_COALESCE_SECONDS = 2.0
+_RESTART_LOCK = threading.Lock()
+_LAST_RESTART = {"ts": 0.0, "value": None}
+
 def restart_nut_services() -> Dict[str, Any]:
     """
     Restart all NUT services in the correct order.
     First stop services in reverse order, then start them in forward order.
     
     Returns:
-        Dict[str, Any]: Success status and message
+        Dict[str, Any]: Success status and message ("busy" is set if another
+        restart is already in progress)
     """
+    if not _RESTART_LOCK.acquire(blocking=False):
+        logger.warning("NUT services restart already in progress, ignoring request")
+        return {
+            "success": False,
+            "busy": True,
+            "message": "A NUT services restart is already in progress"
+        }
+    try:
+        if (_LAST_RESTART["value"] is not None
+                and time.monotonic() - _LAST_RESTART["ts"] < RESTART_COALESCE_SECONDS):
+            logger.info("NUT services were just restarted, returning the previous result")
+            return _LAST_RESTART["value"]
+        
+        result = _restart_nut_services()
+        _LAST_RESTART.update(ts=time.monotonic(), value=result)
+        return result
+    finally:
+        _RESTART_LOCK.release()
+
+def _restart_nut_services() -> Dict[str, Any]:
+    """Stop and start the NUT services; callers go through restart_nut_services()"""
     logger.info("Restarting NUT services...")
+    _LISTING_CACHE["mtime"] = None
+    _NEG_CACHE.clear()
     
     try:
         # Create necessary directories
         try:
-            os.makedirs(NUT_RUN_DIR, exist_ok=True)
-            os.makedirs(NUT_LOG_DIR, exist_ok=True)
-            os.makedirs(NUT_STATE_DIR, exist_ok=True)
-            
-            # Set permissions
-            os.chmod(NUT_RUN_DIR, 0o755)
-            os.chmod(NUT_LOG_DIR, 0o755)
-            os.chmod(NUT_STATE_DIR, 0o755)
+            for nut_dir in (NUT_RUN_DIR, NUT_LOG_DIR, NUT_STATE_DIR):
+                _ensure_dir(nut_dir, 0o755)
         except Exception as e:
             logger.warning(f"Error setting up NUT directories: {str(e)}")
             
         # Check NUT mode
         nut_mode = None
         try:
-            with open(os.path.join(NUT_CONF_DIR, 'nut.conf'), 'r') as f:
-                for line in f:
-                    if line.startswith('MODE='):
-                        nut_mode = line.split('=', 1)[1].strip().strip('"\'')
-                        logger.info(f"Detected NUT mode: {nut_mode}")
-                        break
+            with open(_NUT_PATHS['nut.conf'], 'r') as f:
+                match = _MODE_RE.search(f.read())
+            if match:
+                nut_mode = match.group(1)
+                logger.info(f"Detected NUT mode: {nut_mode}")
         except Exception as e:
             logger.warning(f"Error detecting NUT mode: {str(e)}")
             
@@ -345,84 +519,95 @@ def restart_nut_services() -> Dict[str, Any]:
         # Always use direct commands which are most reliable
         logger.info("Using direct commands to restart services...")
         
-        # Try to stop services gracefully
+        # Try to stop services gracefully; the three stop commands are independent,
+        # so launch them together and wait for all of them
         try:
-            logger.info("Stopping UPS monitor...")
-            subprocess.run(NUT_STOP_MONITOR_CMD, shell=True, check=False, capture_output=True, timeout=10)
-            
-            # Wait a moment
-            time.sleep(1)
-            
-            logger.info("Stopping UPS daemon...")
-            subprocess.run(NUT_STOP_SERVER_CMD, shell=True, check=False, capture_output=True, timeout=10)
-            
-            # Wait a moment
-            time.sleep(1)
-            
-            logger.info("Stopping UPS drivers...")
-            subprocess.run(NUT_STOP_DRIVER_CMD, shell=True, check=False, capture_output=True, timeout=10)
-        except subprocess.SubprocessError as e:
+            logger.info("Stopping UPS monitor, daemon and drivers...")
+            stop_procs = [
+                subprocess.Popen(argv, shell=isinstance(argv, str), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                for argv in _STOP_ARGVS
+            ]
+            for proc in stop_procs:
+                try:
+                    proc.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    logger.warning(f"Timeout while stopping services: {proc.args}")
+                    proc.kill()
+                    proc.wait()
+        except (subprocess.SubprocessError, OSError) as e:
             logger.warning(f"Some services didn't stop cleanly: {str(e)}")
-        except subprocess.TimeoutExpired:
-            logger.warning("Timeout while stopping services")
         
-        # Small delay to ensure services have time to stop
-        time.sleep(2)
+        # Wait (up to the old fixed 2s) for upsd and upsmon to remove their PID files
+        if not _wait_for(lambda: not _any_exists(_UPSD_PID_PATHS + _UPSMON_PID_PATHS), timeout=2):
+            logger.debug("NUT PID files still present after stop, continuing")
         
         # Start services
         try:
             # In netclient mode, we only need upsmon
             if not is_netclient:
                 logger.info("Starting UPS drivers...")
-                driver_result = subprocess.run(NUT_START_DRIVER_CMD, shell=True, capture_output=True, text=True, timeout=20)
+                driver_result = subprocess.run(_START_DRIVER_ARGV, shell=isinstance(_START_DRIVER_ARGV, str), capture_output=True, text=True, timeout=20)
                 if driver_result.returncode != 0:
                     logger.warning(f"Driver start warning: {driver_result.stdout} {driver_result.stderr}")
                 else:
                     logger.info("UPS drivers started")
                 
-                # Wait a moment
+                # Driver PID files are named per driver/UPS, so there is nothing
+                # reliable to poll here; keep the fixed wait
                 time.sleep(2)
                 
                 logger.info("Starting UPS daemon...")
-                server_result = subprocess.run(NUT_START_SERVER_CMD, shell=True, capture_output=True, text=True, timeout=10)
+                server_result = subprocess.run(_START_SERVER_ARGV, shell=isinstance(_START_SERVER_ARGV, str), capture_output=True, text=True, timeout=10)
                 if server_result.returncode != 0:
                     logger.warning(f"Server start warning: {server_result.stdout} {server_result.stderr}")
                 else:
                     logger.info("UPS server started")
                 
-                # Wait a moment
-                time.sleep(2)
+                # Wait for upsd to write its PID file
+                _wait_for(lambda: _any_exists(_UPSD_PID_PATHS), timeout=2)
             else:
                 logger.info("Skipping driver and server startup in netclient mode")
             
             logger.info("Starting UPS monitor...")
-            monitor_result = subprocess.run(NUT_START_MONITOR_CMD, shell=True, capture_output=True, text=True, timeout=10)
+            monitor_result = subprocess.run(_START_MONITOR_ARGV, shell=isinstance(_START_MONITOR_ARGV, str), capture_output=True, text=True, timeout=10)
             if monitor_result.returncode != 0:
                 logger.warning(f"Monitor start warning: {monitor_result.stdout} {monitor_result.stderr}")
             else:
                 logger.info("UPS monitor started")
             
-            # Wait for services to start and become stable
-            time.sleep(3)
+            # Wait for upsmon to start (it writes its PID file once running)
+            _wait_for(lambda: _any_exists(_UPSMON_PID_PATHS), timeout=3)
             
             # Import the check function to verify services are running
             from core.nut.nut_daemon import check_all_services_status, get_ups_monitor_config, test_ups_connection
             
+            def probe_ups():
+                # Get UPS monitor config from upsmon.conf, then test the connection with upsc
+                ups_name, ups_host = get_ups_monitor_config()
+                if not (ups_name and ups_host):
+                    return ups_name, ups_host, None
+                # Services were just restarted, don't reuse a cached probe result
+                test_ups_connection.invalidate()
+                return ups_name, ups_host, test_ups_connection(ups_name, ups_host)
+            
+            # The service status checks and the netclient UPS probe are independent,
+            # so run them side by side
+            status_future = _VERIFY_POOL.submit(check_all_services_status)
+            probe_future = _VERIFY_POOL.submit(probe_ups) if is_netclient else None
+            
             # Check the status after restart
-            status = check_all_services_status()
+            status = status_future.result()
             logger.info(f"Service status after restart: {status}")
             
             # Test UPS connection with upsc
             ups_data = {}
             ups_connection_ok = False
             
-            if is_netclient:
-                # Get UPS monitor config from upsmon.conf
-                ups_name, ups_host = get_ups_monitor_config()
+            if probe_future is not None:
+                ups_name, ups_host, probe_result = probe_future.result()
                 
-                if ups_name and ups_host:
-                    # Test connection to UPS
-                    connection_success, connection_output = test_ups_connection(ups_name, ups_host)
+                if probe_result is not None:
+                    connection_success, connection_output = probe_result
                     if connection_success:
                         logger.info(f"Successfully connected to UPS {ups_name}@{ups_host}")
                         ups_connection_ok = True
@@ -459,7 +644,7 @@ def restart_nut_services() -> Dict[str, Any]:
                     "message": "Failed to restart any NUT services",
                     "status": status
                 }
-        except subprocess.SubprocessError as e:
+        except (subprocess.SubprocessError, OSError) as e:
             logger.error(f"Error starting services: {str(e)}")
             return {
                 "success": False,
@@ -2,10 +2,14 @@
 API routes for advanced NUT configuration management.
 """
 
-from flask import jsonify, request
+import os
+import json
+import hashlib
+from flask import jsonify, request, Response
 from core.logger import system_logger as logger
 
 from .advanced import (
+    NUT_FILES,
     read_nut_config_file,
     write_nut_config_file,
     restart_nut_services,
@@ -13,113 +17,139 @@ from .advanced import (
     get_nut_file_documentation
 )
 
-def register_api_routes(app):
-    """Register all API routes for the advanced NUT configuration section"""
-    
-    @app.route('/api/advanced/nut/files', methods=['GET'])
-    def get_nut_files():
-        """Get list of available NUT configuration files"""
-        try:
-            files = get_available_nut_files()
+def _build_docs_response(docs):
+    """Serialize a documentation response once and derive its strong ETag"""
+    body = json.dumps({"success": True, "documentation": docs}, separators=(",", ":")).encode()
+    return body, hashlib.blake2b(body, digest_size=8).hexdigest()
+
+# NUT_FILES is constant, so the documentation responses are built once at import
+_DOCS_JSON = {name: _build_docs_response(get_nut_file_documentation(name)) for name in NUT_FILES}
+_EMPTY_DOCS_JSON = _build_docs_response({})
+
+def _error(message, code=500, exc=None):
+    """Build the JSON error response shared by all views, logging it (with traceback) when exc is given"""
+    if exc is not None:
+        logger.error(message, exc_info=exc)
+    return jsonify({"success": False, "message": message}), code
+
+def get_nut_files():
+    """Get list of available NUT configuration files"""
+    try:
+        files = get_available_nut_files()
+        return jsonify({
+            "success": True,
+            "files": files
+        })
+    except Exception as e:
+        return _error(f"Error getting NUT configuration files: {str(e)}", exc=e)
+
+def get_nut_config(filename):
+    """Get content of a NUT configuration file"""
+    try:
+        config = read_nut_config_file(filename)
+        if config.get("success", False):
             return jsonify({
                 "success": True,
-                "files": files
+                "config": config
             })
-        except Exception as e:
-            logger.error(f"Error getting NUT configuration files: {str(e)}")
-            return jsonify({
-                "success": False,
-                "message": f"Error getting NUT configuration files: {str(e)}"
-            }), 500
-    
-    @app.route('/api/advanced/nut/config/<filename>', methods=['GET'])
-    def get_nut_config(filename):
-        """Get content of a NUT configuration file"""
-        try:
-            config = read_nut_config_file(filename)
-            if config.get("success", False):
-                return jsonify({
-                    "success": True,
-                    "config": config
-                })
-            else:
-                return jsonify({
-                    "success": False,
-                    "message": config.get("message", "Unknown error")
-                }), 404
-        except Exception as e:
-            logger.error(f"Error reading NUT configuration file {filename}: {str(e)}")
-            return jsonify({
-                "success": False,
-                "message": f"Error reading configuration file: {str(e)}"
-            }), 500
-    
-    @app.route('/api/advanced/nut/config/<filename>', methods=['POST'])
-    def update_nut_config(filename):
-        """Update a NUT configuration file"""
-        try:
-            data = request.json
-            if not data or "content" not in data:
-                return jsonify({
-                    "success": False,
-                    "message": "Missing required parameter: content"
-                }), 400
-            
-            result = write_nut_config_file(filename, data["content"])
-            if result.get("success", False):
-                return jsonify({
-                    "success": True,
-                    "message": result.get("message", "Configuration updated successfully")
-                })
-            else:
-                return jsonify({
-                    "success": False,
-                    "message": result.get("message", "Unknown error")
-                }), 500
-        except Exception as e:
-            logger.error(f"Error updating NUT configuration file {filename}: {str(e)}")
-            return jsonify({
-                "success": False,
-                "message": f"Error updating configuration file: {str(e)}"
-            }), 500
-    
-    @app.route('/api/advanced/nut/restart', methods=['POST'])
-    def restart_nut():
-        """Restart NUT services"""
-        try:
-            result = restart_nut_services()
-            if result.get("success", False):
-                return jsonify({
-                    "success": True,
-                    "message": result.get("message", "Services restarted successfully")
-                })
-            else:
-                return jsonify({
-                    "success": False,
-                    "message": result.get("message", "Unknown error")
-                }), 500
-        except Exception as e:
-            logger.error(f"Error restarting NUT services: {str(e)}")
-            return jsonify({
-                "success": False,
-                "message": f"Error restarting NUT services: {str(e)}"
-            }), 500
-    
-    @app.route('/api/advanced/nut/docs/<filename>', methods=['GET'])
-    def get_nut_docs(filename):
-        """Get documentation for a NUT configuration file"""
-        try:
-            docs = get_nut_file_documentation(filename)
+        else:
+            return _error(config.get("message", "Unknown error"), 404)
+    except Exception as e:
+        return _error(f"Error reading configuration file {filename}: {str(e)}", exc=e)
+
+def update_nut_config(filename):
+    """Update a NUT configuration file"""
+    try:
+        data = request.json
+        if not data or "content" not in data:
+            return _error("Missing required parameter: content", 400)
+
+        result = write_nut_config_file(filename, data["content"])
+        if result.get("success", False):
             return jsonify({
                 "success": True,
-                "documentation": docs
+                "message": result.get("message", "Configuration updated successfully")
             })
-        except Exception as e:
-            logger.error(f"Error getting documentation for {filename}: {str(e)}")
+        else:
+            return _error(result.get("message", "Unknown error"), 500)
+    except Exception as e:
+        return _error(f"Error updating configuration file {filename}: {str(e)}", exc=e)
+
+def restart_nut():
+    """Restart NUT services"""
+    try:
+        result = restart_nut_services()
+        if result.get("success", False):
             return jsonify({
-                "success": False,
-                "message": f"Error getting documentation: {str(e)}"
-            }), 500
+                "success": True,
+                "message": result.get("message", "Services restarted successfully")
+            })
+        else:
+            return _error(result.get("message", "Unknown error"), 429 if result.get("busy") else 500)
+    except Exception as e:
+        return _error(f"Error restarting NUT services: {str(e)}", exc=e)
+
+def get_nut_docs(filename):
+    """Get documentation for a NUT configuration file"""
+    try:
+        body, etag = _DOCS_JSON.get(filename, _EMPTY_DOCS_JSON)
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        return response
+    except Exception as e:
+        return _error(f"Error getting documentation for {filename}: {str(e)}", exc=e)
+
+def get_nut_bundle():
+    """Get all available NUT configuration files with their content and documentation in one response"""
+    try:
+        entries = get_available_nut_files()
+        
+        # ETag from each file's name, mtime and size so unchanged bundles skip the reads entirely
+        stats = []
+        for entry in entries:
+            try:
+                st = os.stat(entry["path"])
+                stats.append(f"{entry['name']}:{st.st_mtime_ns}:{st.st_size}")
+            except OSError:
+                stats.append(f"{entry['name']}:missing")
+        etag = hashlib.blake2b(";".join(stats).encode(), digest_size=8).hexdigest()
+        
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+        
+        files = []
+        documentation = {}
+        for entry in entries:
+            config = read_nut_config_file(entry["name"])
+            if not config.get("success", False):
+                continue
+            documentation[entry["name"]] = config.pop("documentation")
+            config.pop("success")
+            files.append(config)
+        
+        response = jsonify({
+            "success": True,
+            "files": files,
+            "documentation": documentation
+        })
+        response.set_etag(etag)
+        return response
+    except Exception as e:
+        return _error(f"Error getting NUT configuration bundle: {str(e)}", exc=e)
+
+def register_api_routes(app):
+    """Register all API routes for the advanced NUT configuration section"""
+    app.add_url_rule('/api/advanced/nut/files', view_func=get_nut_files, methods=['GET'])
+    app.add_url_rule('/api/advanced/nut/config/<filename>', view_func=get_nut_config, methods=['GET'])
+    app.add_url_rule('/api/advanced/nut/config/<filename>', view_func=update_nut_config, methods=['POST'])
+    app.add_url_rule('/api/advanced/nut/restart', view_func=restart_nut, methods=['POST'])
+    app.add_url_rule('/api/advanced/nut/docs/<filename>', view_func=get_nut_docs, methods=['GET'])
+    app.add_url_rule('/api/advanced/nut/bundle', view_func=get_nut_bundle, methods=['GET'])
     
     logger.info("✅ Registered Advanced NUT Configuration API routes")
-    return app 
\ No newline at end of file
+    return app
@@ -1,9 +1,16 @@
 from flask import jsonify, request, current_app, send_file
+from flask.json.provider import DefaultJSONProvider
+import orjson
+from sqlalchemy import func, select
+import pandas as pd
 from marshmallow import Schema, fields, ValidationError, post_load
 import datetime
 import json
 from dateutil import parser
 import re
+import logging
+from functools import lru_cache
+from operator import attrgetter
 from .settings import (  
     LOG, LOG_LEVEL, LOG_WERKZEUG
 )
@@ -37,47 +44,80 @@ logger.info("�� Initializing api")
 
 class CustomJSONEncoder(json.JSONEncoder):
     def default(self, obj):
-        try:
-            if isinstance(obj, datetime):
-                return obj.isoformat()
-            if hasattr(obj, 'isoformat'):
-                return obj.isoformat()
-            return super().default(obj)
-        except Exception:
-            return str(obj)
+        return _default(obj)
+
+def _default(obj):
+    """Fallback for types orjson can't serialize natively (dates, Decimal, ...)"""
+    try:
+        isoformat = getattr(obj, 'isoformat', None)
+        if isoformat is not None:
+            return isoformat()
+        return str(obj)
+    except Exception:
+        return str(obj)
+
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, used by jsonify() and request.get_json()"""
+
+    def dumps(self, obj, **kwargs):
+        option = _ORJSON_OPTIONS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        if kwargs.get('sort_keys'):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=_default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 def jsonify_pretty(*args, **kwargs):
     """ Formats the JSON in a readable way"""
-    response = jsonify(*args, **kwargs)
-    response.set_data(json.dumps(response.get_json(), indent=2))
-    return response
+    data = args[0] if len(args) == 1 else (list(args) if args else kwargs)
+    # Single serialization pass through whichever provider the app uses
+    provider = current_app.json
+    return current_app.response_class(
+        provider.dumps(data, indent=2, sort_keys=provider.sort_keys),
+        mimetype=provider.mimetype
+    )
 
 
 def get_historical_data(start_time, end_time):
     try:
         UPSData = get_ups_model()
         logger.debug(f"Querying data from {start_time} to {end_time}")
-        data = UPSData.query.filter(
+        # Fetch only the columns needed as typed arrays instead of full ORM rows
+        query = select(
+            UPSData.timestamp_utc, UPSData.ups_realpower_nominal, UPSData.ups_load,
+            UPSData.input_voltage, UPSData.battery_charge
+        ).where(
             UPSData.timestamp_utc.between(start_time, end_time)
-        ).order_by(UPSData.timestamp_utc.asc()).all()
-        logger.debug(f"Found {len(data)} records")
-        result = []
-        for entry in data:
-            try:
-                nominal_power = entry.ups_realpower_nominal if entry.ups_realpower_nominal is not None else 960
-                load = entry.ups_load if entry.ups_load is not None else 0
-                calculated_power = (nominal_power * load) / 100
-                item = {
-                    'timestamp': entry.timestamp_utc.isoformat(),
-                    'input_voltage': float(entry.input_voltage if entry.input_voltage is not None else 0),
-                    'power': float(calculated_power),
-                    'energy': float(calculated_power),
-                    'battery_charge': float(entry.battery_charge if entry.battery_charge is not None else 0)
-                }
-                result.append(item)
-            except (ValueError, TypeError, AttributeError) as e:
-                logger.error(f"Error processing record {entry.id}: {e}")
-                continue
+        ).order_by(UPSData.timestamp_utc.asc())
+        df = pd.read_sql(query, db.session.connection())
+        logger.debug(f"Found {len(df)} records")
+        if df.empty:
+            return []
+
+        # Same defaults as before: 960W nominal power, 0 for missing load/voltage/charge
+        nominal_power = pd.to_numeric(df['ups_realpower_nominal'], errors='coerce').fillna(960)
+        load = pd.to_numeric(df['ups_load'], errors='coerce').fillna(0)
+        power = (nominal_power * load / 100).tolist()
+        input_voltage = pd.to_numeric(df['input_voltage'], errors='coerce').fillna(0).tolist()
+        battery_charge = pd.to_numeric(df['battery_charge'], errors='coerce').fillna(0).tolist()
+        timestamps = [ts.isoformat() for ts in df['timestamp_utc']]
+
+        result = [
+            {
+                'timestamp': timestamp,
+                'input_voltage': voltage,
+                'power': calculated_power,
+                'energy': calculated_power,
+                'battery_charge': charge
+            }
+            for timestamp, voltage, calculated_power, charge
+            in zip(timestamps, input_voltage, power, battery_charge)
+        ]
         logger.debug(f"Processed {len(result)} valid records")
         return result
     except Exception as e:
@@ -90,122 +130,186 @@ def validate_datetime(date_text):
     except ValueError:
         return False
 
+_SANITIZE_RE = re.compile(r'[^a-zA-Z0-9\s\-_\.]')
+
 def sanitize_input(value):
     if isinstance(value, str):
-        return re.sub(r'[^a-zA-Z0-9\s\-_\.]', '', value)
+        return _SANITIZE_RE.sub('', value)
     return value
 
+# (field, default) pairs read by build_ups_data_response; defaults match get_supported_value's
+_RESPONSE_FIELDS = (
+    ('device_model', 'N/A'), ('device_mfr', 'N/A'), ('device_serial', 'N/A'),
+    ('device_type', 'N/A'), ('device_location', 'N/A'), ('ups_status', 'N/A'),
+    ('ups_load', '0'), ('ups_temperature', '0'), ('ups_realpower_nominal', '960'),
+    ('input_voltage', '0'), ('input_frequency', '0'), ('input_voltage_nominal', '0'),
+    ('input_current', '0'), ('output_voltage', '0'), ('output_frequency', '0'),
+    ('output_current', '0'), ('battery_charge', '0'), ('battery_runtime', '0'),
+    ('battery_voltage', '0'), ('battery_temperature', 'N/A'), ('battery_type', 'N/A'),
+    ('ambient_temperature', 'N/A'), ('ambient_humidity', 'N/A'),
+)
+
+def _extract_values(data, fields_with_defaults):
+    """Reads every (field, default) pair from data once, with get_supported_value semantics"""
+    return {field: get_supported_value(data, field, default) for field, default in fields_with_defaults}
+
 def build_ups_data_response(data):
-    device_fields = {
-        'model': get_supported_value(data, 'device_model'),
-        'manufacturer': get_supported_value(data, 'device_mfr'),
-        'serial': get_supported_value(data, 'device_serial'),
-        'type': get_supported_value(data, 'device_type'),
-        'location': get_supported_value(data, 'device_location')
-    }
+    v = _extract_values(data, _RESPONSE_FIELDS)
     try:
-        load = float(get_supported_value(data, 'ups_load', '0'))
-        nominal_power = float(get_supported_value(data, 'ups_realpower_nominal', '960'))
-        calculated_power = (load * nominal_power) / 100
+        calculated_power = (float(v['ups_load']) * float(v['ups_realpower_nominal'])) / 100
         power_value = str(round(calculated_power, 2))
     except (ValueError, TypeError):
         power_value = '0'
     return {
-        'device': device_fields,
+        'device': {
+            'model': v['device_model'],
+            'manufacturer': v['device_mfr'],
+            'serial': v['device_serial'],
+            'type': v['device_type'],
+            'location': v['device_location']
+        },
         'ups': {
-            'status': get_supported_value(data, 'ups_status'),
-            'load': get_supported_value(data, 'ups_load', '0'),
-            'temperature': get_supported_value(data, 'ups_temperature', '0'),
+            'status': v['ups_status'],
+            'load': v['ups_load'],
+            'temperature': v['ups_temperature'],
             'power': power_value,
             'realpower': power_value,
-            'realpower_nominal': get_supported_value(data, 'ups_realpower_nominal', '960')
+            'realpower_nominal': v['ups_realpower_nominal']
         },
         'input': {
-            'voltage': get_supported_value(data, 'input_voltage', '0'),
-            'frequency': get_supported_value(data, 'input_frequency', '0'),
-            'voltage_nominal': get_supported_value(data, 'input_voltage_nominal', '0'),
-            'current': get_supported_value(data, 'input_current', '0')
+            'voltage': v['input_voltage'],
+            'frequency': v['input_frequency'],
+            'voltage_nominal': v['input_voltage_nominal'],
+            'current': v['input_current']
         },
         'output': {
-            'voltage': get_supported_value(data, 'output_voltage', '0'),
-            'frequency': get_supported_value(data, 'output_frequency', '0'),
-            'current': get_supported_value(data, 'output_current', '0')
+            'voltage': v['output_voltage'],
+            'frequency': v['output_frequency'],
+            'current': v['output_current']
         },
         'battery': {
-            'charge': get_supported_value(data, 'battery_charge', '0'),
-            'runtime': get_supported_value(data, 'battery_runtime', '0'),
-            'voltage': get_supported_value(data, 'battery_voltage', '0'),
-            'temperature': get_supported_value(data, 'battery_temperature', 'N/A'),
-            'type': get_supported_value(data, 'battery_type', 'N/A')
+            'charge': v['battery_charge'],
+            'runtime': v['battery_runtime'],
+            'voltage': v['battery_voltage'],
+            'temperature': v['battery_temperature'],
+            'type': v['battery_type']
         },
         'ambient': {
-            'temperature': get_supported_value(data, 'ambient_temperature', 'N/A'),
-            'humidity': get_supported_value(data, 'ambient_humidity', 'N/A')
+            'temperature': v['ambient_temperature'],
+            'humidity': v['ambient_humidity']
         }
     }
 
 def format_chart_data(data, field):
-    formatted_data = []
-    for entry in data:
-        try:
-            if field in entry and entry[field] is not None:
-                formatted_data.append({
-                    'x': entry['timestamp'],
-                    'y': float(entry[field]) if isinstance(entry[field], (int, float, str)) else 0
-                })
-        except (KeyError, ValueError, TypeError) as e:
-            logger.debug(f"Skipping data point for {field}: {e}")
-            continue
-    return formatted_data
+    # Collect the candidate points, then coerce all values in one pass; non-numeric ones are dropped
+    rows = [
+        (entry['timestamp'], entry[field]) for entry in data
+        if entry.get(field) is not None and 'timestamp' in entry
+    ]
+    if not rows:
+        return []
+    timestamps, values = zip(*rows)
+    y = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').astype(float)
+    skipped = int(y.isna().sum())
+    if skipped:
+        logger.debug(f"Skipping {skipped} non-numeric data points for {field}")
+    return [
+        {'x': timestamp, 'y': value}
+        for timestamp, value, keep in zip(timestamps, y.tolist(), y.notna().tolist())
+        if keep
+    ]
 
 # Add SETTINGS_DIR
 SETTINGS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance', 'settings')
+# Resolved once; save_settings only accepts bare filenames inside it
+_SETTINGS_DIR_REAL = os.path.realpath(SETTINGS_DIR)
+
+# /health reports the UPS record count; COUNT(*) scans the whole table, so reuse it for a while
+HEALTH_COUNT_TTL = 60
+_count_cache = {'ts': 0.0, 'value': 0}
+
+# cpu_percent(interval=None) reports usage since its previous call without blocking;
+# resample at most once per SYSTEM_STATS_MIN_INTERVAL so the window stays meaningful
+SYSTEM_STATS_MIN_INTERVAL = 1.0
+_cpu_sample = {'ts': 0.0, 'value': 0.0}
+
+def get_cpu_percent():
+    """Returns the system CPU usage without blocking the request"""
+    import psutil
+    now = time.monotonic()
+    if now - _cpu_sample['ts'] >= SYSTEM_STATS_MIN_INTERVAL:
+        _cpu_sample['value'] = psutil.cpu_percent(interval=None)
+        _cpu_sample['ts'] = now
+    return _cpu_sample['value']
+
+def get_cached_record_count(UPSDynamicData, force=False):
+    """Returns the UPS dynamic data row count, recounted at most every HEALTH_COUNT_TTL seconds"""
+    now = time.monotonic()
+    if force or now - _count_cache['ts'] > HEALTH_COUNT_TTL:
+        _count_cache['value'] = db.session.query(func.count(UPSDynamicData.id)).scalar() or 0
+        _count_cache['ts'] = now
+    return _count_cache['value']
+
+# /api/data/<column> names answered even when they are not columns of the UPS models
+_COMPUTED_COLUMNS = frozenset({'timestamp', 'ups_realpower_days', 'ups_realpower_hrs'})
+
+# API sub-modules whose routes register_api_routes mounts, in registration order
+_SUB_ROUTE_REGISTRARS = (
+    register_mail_api_routes,
+    register_upscmd_api_routes,
+    register_upsrw_api_routes,
+    register_events_api_routes,
+    register_infoapi_routes,
+)
 
 def register_api_routes(app, layouts_file='layouts.json'):
     """Registers all API routes for the application"""
-    # Register mail API routes
-    register_mail_api_routes(app)
-    
-    # Register upscmd API routes
-    register_upscmd_api_routes(app)
-    
-    # Register upsrw API routes
-    register_upsrw_api_routes(app)
-    
-    # Register events API routes
-    register_events_api_routes(app)
-    
-    # Register infoapi routes
-    register_infoapi_routes(app)
+    # Prime the CPU counter so the first /api/system_stats call has a baseline
+    get_cpu_percent()
 
-    def jsonify_pretty(*args, **kwargs):
-        """ Formats the JSON in a readable way"""
-        response = jsonify(*args, **kwargs)
-        response.set_data(json.dumps(response.get_json(), indent=2))
-        return response
+    # Register the mail, upscmd, upsrw, events and infoapi API routes
+    for register_sub_routes in _SUB_ROUTE_REGISTRARS:
+        register_sub_routes(app)
 
     @app.route('/api/data/<column>')
     def get_column_data(column):
         """Returns the value of a specific column"""
+        # Read the timezone and the current time once; every return path below reuses them
+        tz = app.CACHE_TIMEZONE
+        current_time = datetime.now(tz)
+        current_time_iso = current_time.isoformat()
         try:
             logger.debug(f"Requesting column: {column}")
-            
-            # Access CACHE_TIMEZONE through app
-            current_time = datetime.now(app.CACHE_TIMEZONE)
+
+            # Reject names that are neither a model column nor a computed value before any query
+            UPSDynamicData = get_ups_model()
+            UPSStaticData = create_static_model()
+            if (column not in _COMPUTED_COLUMNS
+                    and column not in UPSDynamicData.__table__.columns
+                    and column not in UPSStaticData.__table__.columns):
+                return jsonify({
+                    'success': False,
+                    'error': f'Column {column} not found or has no value',
+                    'data': {
+                        column: None,
+                        'timestamp': current_time_iso
+                    }
+                }), 404
 
             # Special handling for ups_realpower_days
             if column == 'ups_realpower_days':
-                UPSDynamicData = get_ups_model()
                 # Query to find the last non-null and non-zero value
-                last_value = UPSDynamicData.query\
-                    .filter(UPSDynamicData.ups_realpower_days.isnot(None))\
-                    .filter(UPSDynamicData.ups_realpower_days != 0)\
-                    .order_by(UPSDynamicData.timestamp_utc.desc())\
-                    .first()
+                last_value = db.session.execute(
+                    select(UPSDynamicData.ups_realpower_days, UPSDynamicData.timestamp_utc)
+                    .where(UPSDynamicData.ups_realpower_days.isnot(None),
+                           UPSDynamicData.ups_realpower_days != 0)
+                    .order_by(UPSDynamicData.timestamp_utc.desc())
+                    .limit(1)
+                ).first()
                 
                 if last_value:
-                    value = getattr(last_value, column)
-                    timestamp = format_datetime_tz(last_value.timestamp_utc).isoformat()
+                    value, timestamp_utc = last_value
+                    timestamp = format_datetime_tz(timestamp_utc, tz).isoformat()
                     return jsonify({
                         'success': True,
                         'data': {
@@ -219,28 +323,33 @@ def register_api_routes(app, layouts_file='layouts.json'):
                 return jsonify({
                     'success': True,
                     'data': {
-                        'timestamp': current_time.isoformat(),
-                        column: current_time.isoformat()
+                        'timestamp': current_time_iso,
+                        column: current_time_iso
                     }
                 })
 
-            # First check in dynamic data
-            UPSDynamicData = get_ups_model()
-            dynamic_data = UPSDynamicData.query.order_by(UPSDynamicData.timestamp_utc.desc()).first()
+            # First check in dynamic data, selecting only the requested column of the latest row
+            dynamic_data = None
+            if column in UPSDynamicData.__table__.columns:
+                dynamic_data = db.session.execute(
+                    select(getattr(UPSDynamicData, column), UPSDynamicData.timestamp_utc)
+                    .order_by(UPSDynamicData.timestamp_utc.desc())
+                    .limit(1)
+                ).first()
             
-            if dynamic_data and hasattr(dynamic_data, column):
-                value = getattr(dynamic_data, column)
+            if dynamic_data:
+                value, timestamp_utc = dynamic_data
                 if value is not None:
                     # Format the value based on type
                     if isinstance(value, datetime):
-                        value = format_datetime_tz(value).isoformat()
+                        value = format_datetime_tz(value, tz).isoformat()
                     elif isinstance(value, (float, int)):
                         value = float(value) if isinstance(value, float) else int(value)
                     else:
                         value = str(value)
 
                     # Ensure the timestamp is in the correct timezone
-                    timestamp = format_datetime_tz(dynamic_data.timestamp_utc).isoformat()
+                    timestamp = format_datetime_tz(timestamp_utc, tz).isoformat()
                     
                     return jsonify({
                         'success': True,
@@ -250,23 +359,29 @@ def register_api_routes(app, layouts_file='layouts.json'):
                         }
                     })
 
-            # If not found in dynamic data, check in static data
-            UPSStaticData = create_static_model()
-            static_data = UPSStaticData.query.first()
+            # If not found in dynamic data, check in static data (again only the needed columns)
+            static_columns = UPSStaticData.__table__.columns
+            has_timestamp = 'timestamp_utc' in static_columns
+            static_data = None
+            if column in static_columns:
+                selected = [getattr(UPSStaticData, column)]
+                if has_timestamp:
+                    selected.append(UPSStaticData.timestamp_utc)
+                static_data = db.session.execute(select(*selected).limit(1)).first()
             
-            if static_data and hasattr(static_data, column):
-                value = getattr(static_data, column)
+            if static_data:
+                value = static_data[0]
                 if value is not None:
                     # Format the value based on type
                     if isinstance(value, datetime):
-                        value = format_datetime_tz(value).isoformat()
+                        value = format_datetime_tz(value, tz).isoformat()
                     elif isinstance(value, (float, int)):
                         value = float(value) if isinstance(value, float) else int(value)
                     else:
                         value = str(value)
 
                     # Use the timestamp of the static data if available, otherwise use the current timestamp
-                    timestamp = (format_datetime_tz(static_data.timestamp_utc) if hasattr(static_data, 'timestamp_utc') 
+                    timestamp = (format_datetime_tz(static_data[1], tz) if has_timestamp
                                else current_time).isoformat()
                     
                     return jsonify({
@@ -278,16 +393,19 @@ def register_api_routes(app, layouts_file='layouts.json'):
                     })
             
             # Special handling for ups_realpower_hrs
-            if column == 'ups_realpower_hrs' and dynamic_data:
-                value = get_realpower_hrs(dynamic_data)
-                timestamp = format_datetime_tz(dynamic_data.timestamp_utc).isoformat()
-                return jsonify({
-                    'success': True,
-                    'data': {
-                        column: value,
-                        'timestamp': timestamp
-                    }
-                })
+            if column == 'ups_realpower_hrs':
+                # The calculation needs several columns, so load the full latest row here
+                latest_data = UPSDynamicData.query.order_by(UPSDynamicData.timestamp_utc.desc()).first()
+                if latest_data:
+                    value = get_realpower_hrs(latest_data)
+                    timestamp = format_datetime_tz(latest_data.timestamp_utc, tz).isoformat()
+                    return jsonify({
+                        'success': True,
+                        'data': {
+                            column: value,
+                            'timestamp': timestamp
+                        }
+                    })
             
             # If the column is not found, return 404
             logger.warning(f"Column {column} not found in either dynamic or static data")
@@ -296,7 +414,7 @@ def register_api_routes(app, layouts_file='layouts.json'):
                 'error': f'Column {column} not found or has no value',
                 'data': {
                     column: None,
-                    'timestamp': current_time.isoformat()
+                    'timestamp': current_time_iso
                 }
             }), 404
             
@@ -307,7 +425,7 @@ def register_api_routes(app, layouts_file='layouts.json'):
                 'error': str(e),
                 'data': {
                     column: None,
-                    'timestamp': datetime.now(app.CACHE_TIMEZONE).isoformat()
+                    'timestamp': current_time_iso
                 }
             }), 500
 
@@ -319,15 +437,21 @@ def register_api_routes(app, layouts_file='layouts.json'):
             # Access CACHE_TIMEZONE through app
             current_time = datetime.now(app.CACHE_TIMEZONE)
             
-            last_record = UPSDynamicData.query.order_by(UPSDynamicData.timestamp_utc.desc()).first()
+            last_update = db.session.query(UPSDynamicData.timestamp_utc)\
+                .order_by(UPSDynamicData.timestamp_utc.desc())\
+                .limit(1)\
+                .scalar()
             
             status = {
                 'success': True,
                 'timestamp': current_time.isoformat(),
                 'database': {
-                    'status': True if last_record else False,
-                    'last_update': last_record.timestamp_utc.isoformat() if last_record else None,
-                    'record_count': UPSDynamicData.query.count()
+                    'status': last_update is not None,
+                    'last_update': last_update.isoformat() if last_update else None,
+                    # Exact count only on ?full=1, otherwise a count at most HEALTH_COUNT_TTL old
+                    'record_count': get_cached_record_count(
+                        UPSDynamicData, force=request.args.get('full') == '1'
+                    )
                 }
             }
             
@@ -361,13 +485,13 @@ def register_api_routes(app, layouts_file='layouts.json'):
             return jsonify({'error': 'Invalid file type. Only JSON files are allowed'}), 400
 
         try:
-            file_path = os.path.join(SETTINGS_DIR, filename)
-            if not os.path.realpath(file_path).startswith(os.path.realpath(SETTINGS_DIR)):
+            if os.sep in filename or '..' in filename:
                 return jsonify({'error': 'Invalid file path'}), 400
+            file_path = os.path.join(_SETTINGS_DIR_REAL, filename)
 
             try:
-                with open(file_path, 'r') as f:
-                    existing_data = json.load(f)
+                with open(file_path, 'rb') as f:
+                    existing_data = orjson.loads(f.read())
             except FileNotFoundError:
                 existing_data = {}
 
@@ -376,10 +500,20 @@ def register_api_routes(app, layouts_file='layouts.json'):
                 return jsonify({'error': 'No JSON data provided'}), 400
 
             existing_data.update(new_data)
-            os.makedirs(SETTINGS_DIR, exist_ok=True)
+            os.makedirs(_SETTINGS_DIR_REAL, exist_ok=True)
             
-            with open(file_path, 'w') as f:
-                json.dump(existing_data, f, indent=4)
+            # Write to a temp file and swap it in, so a crash never leaves a truncated settings file
+            tmp_path = f"{file_path}.tmp"
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(orjson.dumps(existing_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, file_path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
             
             return jsonify({'status': 'success'})
         except Exception as e:
@@ -392,7 +526,7 @@ def register_api_routes(app, layouts_file='layouts.json'):
             import psutil
             
             # Get system stats using psutil
-            cpu = psutil.cpu_percent(interval=0.5)
+            cpu = get_cpu_percent()
             memory = psutil.virtual_memory()
             
             # Return JSON response
@@ -415,7 +549,8 @@ def register_api_routes(app, layouts_file='layouts.json'):
         to the frontend without directly accessing the WebSocket.
         """
         try:
-            data = request.json
+            # Trusted internal callers always send JSON, so decode the raw body directly
+            data = orjson.loads(request.get_data(cache=False)) if request.content_length else None
             if not data:
                 return jsonify({"success": False, "message": "No data provided"}), 400
             
@@ -450,32 +585,30 @@ def register_api_routes(app, layouts_file='layouts.json'):
 
     return app 
 
-def format_datetime(dt):
+def format_datetime(dt, timezone=None):
     """
     Format the datetime object using the cached timezone.
     If dt is naive, assume it is in UTC and then convert it.
     
-    Note: This function should be called within a Flask request context.
+    Note: Without an explicit timezone this must be called within a Flask app context.
     """
-    # Get timezone from Flask current_app
-    from flask import current_app
-    timezone = current_app.CACHE_TIMEZONE
+    if timezone is None:
+        timezone = current_app.CACHE_TIMEZONE
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=pytz.utc)
     dt = dt.astimezone(timezone)
     return dt.isoformat() 
 
-def ensure_timezone(dt):
+def ensure_timezone(dt, tz=None):
     """
     Ensure datetime has the configured timezone.
     
-    Note: This function should be called within a Flask request context.
+    Note: Without an explicit tz this must be called within a Flask app context.
     """
     if dt is None:
         return None
-    # Get timezone from Flask current_app
-    from flask import current_app
-    tz = current_app.CACHE_TIMEZONE
+    if tz is None:
+        tz = current_app.CACHE_TIMEZONE
     if dt.tzinfo is None:
         return tz.localize(dt)
     return dt.astimezone(tz) 
@@ -486,28 +619,39 @@ def debug_value(value):
         return "None"
     return f"{type(value).__name__}: {str(value)}"
 
+@lru_cache(maxsize=None)
+def _column_getter(model):
+    """Returns (column names, attrgetter fetching them all) for a model class"""
+    names = tuple(c.name for c in model.__table__.columns)
+    getter = attrgetter(*names)
+    if len(names) == 1:
+        # attrgetter returns a bare value rather than a tuple for a single name
+        return names, lambda obj: (getter(obj),)
+    return names, getter
+
 def log_query_result(data, source):
     """Helper function to log the results of queries"""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
     if data is None:
-        logger.debug(f"{source} query returned None")
+        logger.debug("%s query returned None", source)
         return
     
-    logger.debug(f"{source} query returned data with columns: {[c.name for c in data.__table__.columns]}")
-    for column in data.__table__.columns:
-        value = getattr(data, column.name, None)
-        logger.debug(f"Column {column.name}: {debug_value(value)}") 
+    names, getter = _column_getter(type(data))
+    values = {name: debug_value(value) for name, value in zip(names, getter(data))}
+    logger.debug("%s query returned data with columns: %s", source, values)
 
-def format_datetime_tz(dt):
+def format_datetime_tz(dt, tz=None):
     """
     Format datetime with timezone.
     
-    Note: This function should be called within a Flask request context.
+    Note: Without an explicit tz this must be called within a Flask app context.
+    Callers formatting several values should read the timezone once and pass it.
     """
     if dt is None:
         return None
-    # Get timezone from Flask current_app
-    from flask import current_app
-    tz = current_app.CACHE_TIMEZONE
+    if tz is None:
+        tz = current_app.CACHE_TIMEZONE
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=tz)
     return dt
@@ -516,10 +660,9 @@ def get_realpower_hrs(dynamic_data):
     """Helper function to calculate ups_realpower_hrs if not present"""
     try:
         # First try to get the value directly
-        if hasattr(dynamic_data, 'ups_realpower_hrs'):
-            value = getattr(dynamic_data, 'ups_realpower_hrs')
-            if value is not None:
-                return float(value)
+        value = getattr(dynamic_data, 'ups_realpower_hrs', None)
+        if value is not None:
+            return float(value)
         
         # If not available, calculate from realpower and load
         realpower = getattr(dynamic_data, 'ups_realpower_nominal', None)
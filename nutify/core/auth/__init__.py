@@ -5,23 +5,89 @@ This module provides authentication functionality for the Nutify application.
 It handles login/logout, session management, and authentication decorators.
 """
 
-from functools import wraps
+from functools import wraps, lru_cache
 from flask import session, request, jsonify, redirect, url_for, current_app, render_template
 from typing import Optional, Dict, Any
+from collections import OrderedDict
 import os
 import secrets
+import logging
+import traceback
+import threading
+import time
 
 # These will be set during initialization
 LoginAuth = None
 logger = None
+# DISABLE_AUTH resolved once by init_auth_module(); None until then
+_AUTH_DISABLED = None
+# Set once a configured login system has been seen; users can't drop back to zero
+_login_configured_latch = False
+# Whether the LoginAuth model has a role column, decided once by init_auth_module()
+_USER_HAS_ROLE = False
+# Session key set at login; is_authenticated() checks just this one key
+_AUTH_SESSION_KEY = '_a'
 
+class TimeLimitedMaxSizeCache:
+    """
+    Small LRU cache whose entries expire a fixed time after they were loaded.
+    
+    Args:
+        ttl_ns: Entry lifetime in nanoseconds (time.monotonic_ns based)
+        max_size: Maximum number of entries; the least recently used is evicted first
+    """
+    
+    def __init__(self, ttl_ns: int, max_size: int):
+        self._ttl_ns = ttl_ns
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, loader):
+        """Return the cached value for key, calling loader() on a miss or expiry."""
+        now = time.monotonic_ns()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self._ttl_ns:
+                self._entries.move_to_end(key)
+                return entry[1]
+        
+        # Load outside the lock so a slow query doesn't block other lookups
+        value = loader()
+        with self._lock:
+            self._entries[key] = (now, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+        return value
+    
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+
+# (user_id, page_name) -> (user active, has permission, username) for require_permission
+_perm_cache = TimeLimitedMaxSizeCache(ttl_ns=10_000_000_000, max_size=1024)
+# Part of every cache key; bumped on invalidation so in-flight loads can't store stale results
+_perm_generation = 0
+
+def invalidate_permission_cache() -> None:
+    """Forget cached permission checks (call after changing users or their permissions)."""
+    global _perm_generation
+    _perm_generation += 1
+    _perm_cache.clear()
+
+_TRUTHY = frozenset({'1', 'true', 'yes', 'on'})
+
+@lru_cache(maxsize=8)
 def _get_env_flag(name: str) -> bool:
-    """Check if an environment variable is set to a truthy value."""
-    value = os.getenv(name, '').strip().lower()
-    return value in {'1', 'true', 'yes', 'on'}
+    """Check if an environment variable is set to a truthy value (read once per name)."""
+    return os.getenv(name, '').strip().lower() in _TRUTHY
 
 def is_auth_disabled() -> bool:
     """Check if authentication is disabled via environment variable."""
+    if _AUTH_DISABLED is not None:
+        return _AUTH_DISABLED
     return _get_env_flag('DISABLE_AUTH')
 
 def init_auth_module(login_model, auth_logger=None):
@@ -32,9 +98,12 @@ def init_auth_module(login_model, auth_logger=None):
         login_model: The LoginAuth model class
         auth_logger: Logger instance for authentication operations
     """
-    global LoginAuth, logger
+    global LoginAuth, logger, _AUTH_DISABLED, _USER_HAS_ROLE
     LoginAuth = login_model
     logger = auth_logger
+    _USER_HAS_ROLE = hasattr(login_model, 'role')
+    # The environment doesn't change after startup, so read DISABLE_AUTH only once
+    _AUTH_DISABLED = _get_env_flag('DISABLE_AUTH')
     
     if logger:
         logger.info("🔐 Authentication module initialized")
@@ -48,7 +117,11 @@ def is_authenticated() -> bool:
     """
     if is_auth_disabled():
         return True
-    return 'user_id' in session and 'username' in session
+    current_session = session._get_current_object()
+    if _AUTH_SESSION_KEY in current_session:
+        return True
+    # Sessions created before the marker key existed
+    return 'user_id' in current_session and 'username' in current_session
 
 def get_current_user() -> Optional[Dict[str, Any]]:
     """
@@ -64,14 +137,17 @@ def get_current_user() -> Optional[Dict[str, Any]]:
             'last_login': None,
             'role': 'administrator'
         }
-    if not is_authenticated():
+    # Resolve the session proxy once and read every key from the real object
+    current_session = session._get_current_object()
+    if 'user_id' not in current_session or 'username' not in current_session:
         return None
     
+    user_id = current_session['user_id']
     return {
-        'id': session.get('user_id'),
-        'username': session.get('username'),
-        'last_login': session.get('last_login'),
-        'role': session.get('role', 'admin' if session.get('user_id') == 1 else 'viewer')
+        'id': user_id,
+        'username': current_session['username'],
+        'last_login': current_session.get('last_login'),
+        'role': current_session.get('role', 'admin' if user_id == 1 else 'viewer')
     }
 
 def is_admin() -> bool:
@@ -113,10 +189,11 @@ def login_user(username: str, password: str) -> bool:
     
     user = LoginAuth.authenticate_user(username, password)
     if user:
+        session[_AUTH_SESSION_KEY] = 1
         session['user_id'] = user.id
         session['username'] = user.username
         session['last_login'] = user.last_login.isoformat() if user.last_login else None
-        session['role'] = getattr(user, 'role', 'admin' if user.id == 1 else 'viewer')
+        session['role'] = user.role if _USER_HAS_ROLE else ('admin' if user.id == 1 else 'viewer')
         session.permanent = True
         
         if logger:
@@ -131,10 +208,67 @@ def logout_user() -> None:
     """Logout the current user by clearing the session."""
     username = session.get('username', 'unknown')
     session.clear()
+    invalidate_permission_cache()
     
     if logger:
         logger.info(f"🔐 User {username} logged out")
 
+# Pre-serialized bodies for the errors _auth_gate answers with
+_NOT_CONFIGURED_JSON = b'{"error": "Login system not configured"}\n'
+_AUTH_REQUIRED_JSON = b'{"error": "Authentication required"}\n'
+_ADMIN_REQUIRED_JSON = b'{"error": "Admin privileges required"}\n'
+
+def _json_error(body: bytes, status: int):
+    """Wrap a pre-serialized JSON error body in a response."""
+    return current_app.response_class(body, status=status, mimetype='application/json')
+
+def _auth_url(endpoint: str) -> str:
+    """url_for() for the auth redirects, memoized per app in app.extensions."""
+    urls = current_app.extensions.setdefault('nutify_auth', {})
+    url = urls.get(endpoint)
+    if url is None:
+        url = urls[endpoint] = url_for(endpoint)
+    return url
+
+def _auth_gate(admin: bool = False, json_only: bool = False):
+    """
+    Run the checks shared by the authentication decorators.
+    
+    Args:
+        admin: Also require admin privileges
+        json_only: Always answer with JSON errors instead of redirecting HTML requests
+        
+    Returns:
+        None if the request may proceed, otherwise the response to return
+    """
+    if is_auth_disabled():
+        return None
+    
+    wants_json = json_only or request.is_json
+    
+    # First check if login system is configured
+    if not is_login_configured():
+        if wants_json:
+            return _json_error(_NOT_CONFIGURED_JSON, 503)
+        return redirect(_auth_url('auth.setup'))
+    
+    if not is_authenticated():
+        if wants_json:
+            return _json_error(_AUTH_REQUIRED_JSON, 401)
+        return redirect(_auth_url('auth.login'))
+    
+    if admin and not is_admin():
+        if wants_json:
+            return _json_error(_ADMIN_REQUIRED_JSON, 403)
+        return redirect(_auth_url('auth.login'))
+    
+    return None
+
+# DISABLE_AUTH is a deploy-time switch, so the decorators below check it when they
+# are applied and return the view unwrapped if auth is off. Views are decorated at
+# import or route registration, before init_auth_module() runs, so is_auth_disabled()
+# reads the environment directly at that point.
+
 def require_auth(f):
     """
     Decorator to require authentication for a route.
@@ -145,24 +279,13 @@ def require_auth(f):
     Returns:
         The decorated function
     """
+    if is_auth_disabled():
+        return f
+    
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if is_auth_disabled():
-            return f(*args, **kwargs)
-
-        # First check if login system is configured
-        if not is_login_configured():
-            if request.is_json:
-                return jsonify({'error': 'Login system not configured'}), 503
-            else:
-                return redirect(url_for('auth.setup'))
-        
-        if not is_authenticated():
-            if request.is_json:
-                return jsonify({'error': 'Authentication required'}), 401
-            else:
-                return redirect(url_for('auth.login'))
-        return f(*args, **kwargs)
+        gate = _auth_gate()
+        return gate if gate is not None else f(*args, **kwargs)
     return decorated_function
 
 def require_auth_json(f):
@@ -175,18 +298,13 @@ def require_auth_json(f):
     Returns:
         The decorated function
     """
+    if is_auth_disabled():
+        return f
+    
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if is_auth_disabled():
-            return f(*args, **kwargs)
-
-        # First check if login system is configured
-        if not is_login_configured():
-            return jsonify({'error': 'Login system not configured'}), 503
-        
-        if not is_authenticated():
-            return jsonify({'error': 'Authentication required'}), 401
-        return f(*args, **kwargs)
+        gate = _auth_gate(json_only=True)
+        return gate if gate is not None else f(*args, **kwargs)
     return decorated_function
 
 def require_admin(f):
@@ -199,31 +317,13 @@ def require_admin(f):
     Returns:
         The decorated function
     """
+    if is_auth_disabled():
+        return f
+    
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if is_auth_disabled():
-            return f(*args, **kwargs)
-
-        # First check if login system is configured
-        if not is_login_configured():
-            if request.is_json:
-                return jsonify({'error': 'Login system not configured'}), 503
-            else:
-                return redirect(url_for('auth.setup'))
-        
-        if not is_authenticated():
-            if request.is_json:
-                return jsonify({'error': 'Authentication required'}), 401
-            else:
-                return redirect(url_for('auth.login'))
-        
-        if not is_admin():
-            if request.is_json:
-                return jsonify({'error': 'Admin privileges required'}), 403
-            else:
-                return redirect(url_for('auth.login'))
-        
-        return f(*args, **kwargs)
+        gate = _auth_gate(admin=True)
+        return gate if gate is not None else f(*args, **kwargs)
     return decorated_function
 
 def require_permission(page_name):
@@ -237,23 +337,14 @@ def require_permission(page_name):
         The decorated function
     """
     def decorator(f):
+        if is_auth_disabled():
+            return f
+        
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            if is_auth_disabled():
-                return f(*args, **kwargs)
-
-            # First check if login system is configured
-            if not is_login_configured():
-                if request.is_json:
-                    return jsonify({'error': 'Login system not configured'}), 503
-                else:
-                    return redirect(url_for('auth.setup'))
-            
-            if not is_authenticated():
-                if request.is_json:
-                    return jsonify({'error': 'Authentication required'}), 401
-                else:
-                    return redirect(url_for('auth.login'))
+            gate = _auth_gate()
+            if gate is not None:
+                return gate
             
             # Admin can access everything
             if is_admin():
@@ -281,23 +372,34 @@ def require_permission(page_name):
                     else:
                         return render_template('auth/access_denied.html', page_name=page_name.capitalize()), 403
                 
-                user = LoginAuth.query.filter_by(id=current_user['id'], is_active=True).first()
-                if not user:
+                user_id = current_user['id']
+                
+                def load_permission():
+                    user = LoginAuth.query.filter_by(id=user_id, is_active=True).first()
+                    if not user:
+                        return False, False, None
+                    return True, user.has_permission(page_name), user.username
+                
+                # Cached for a few seconds so hot pages don't hit the database on every request
+                user_active, has_permission, username = _perm_cache.get(
+                    (_perm_generation, user_id, page_name), load_permission
+                )
+                if not user_active:
                     if logger:
-                        logger.warning(f"🔐 User {current_user['id']} not found or inactive for {page_name}")
+                        logger.warning(f"🔐 User {user_id} not found or inactive for {page_name}")
                     if request.is_json:
                         return jsonify({'error': 'User not found'}), 403
                     else:
                         return render_template('auth/access_denied.html', page_name=page_name.capitalize()), 403
                 
-                if user.has_permission(page_name):
+                if has_permission:
                     if logger:
-                        logger.debug(f"🔐 Permission granted: user {user.username} access to {page_name}")
+                        logger.debug(f"🔐 Permission granted: user {username} access to {page_name}")
                     return f(*args, **kwargs)
                 
                 # Access denied - user doesn't have permission
                 if logger:
-                    logger.info(f"🔐 Access denied: user {user.username} lacks permission for {page_name}")
+                    logger.info(f"🔐 Access denied: user {username} lacks permission for {page_name}")
                 
                 if request.is_json:
                     return jsonify({'error': f'Access denied to {page_name} page'}), 403
@@ -306,10 +408,9 @@ def require_permission(page_name):
                     return render_template('auth/access_denied.html', page_name=page_name.capitalize()), 403
                     
             except Exception as e:
-                if logger:
-                    logger.error(f"🔐 Exception checking permissions for {page_name}: {str(e)}")
-                    import traceback
-                    logger.error(f"🔐 Traceback: {traceback.format_exc()}")
+                if logger and logger.isEnabledFor(logging.ERROR):
+                    logger.error("🔐 Exception checking permissions for %s: %s", page_name, e)
+                    logger.error("🔐 Traceback: %s", traceback.format_exc())
                 
                 if request.is_json:
                     return jsonify({'error': 'Error checking permissions'}), 500
@@ -327,7 +428,8 @@ def is_login_configured() -> bool:
     Returns:
         bool: True if login is configured, False otherwise
     """
-    if is_auth_disabled():
+    global _login_configured_latch
+    if is_auth_disabled() or _login_configured_latch:
         return True
 
     if not LoginAuth:
@@ -336,7 +438,9 @@ def is_login_configured() -> bool:
         return False
     
     try:
-        return LoginAuth.is_login_configured()
+        # Only the positive answer is remembered, so the first user is picked up immediately after setup
+        _login_configured_latch = LoginAuth.is_login_configured()
+        return _login_configured_latch
     except Exception as e:
         if logger:
             logger.debug(f"🔐 Error checking login configuration: {str(e)}")
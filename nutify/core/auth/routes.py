@@ -14,7 +14,8 @@ from . import (
     is_login_configured,
     is_admin,
     is_auth_disabled,
-    require_admin
+    require_admin,
+    invalidate_permission_cache
 )
 from datetime import datetime
 import pytz
@@ -573,6 +574,8 @@ def api_admin_update_user_role(user_id):
         
         from core.db.ups import db
         db.session.commit()
+        # Default page permissions depend on the role, so cached checks are stale now
+        invalidate_permission_cache()
         
         logger.info(f"🔐 Admin updated role for user {user.username} to {new_role}")
         return jsonify({'success': True, 'message': 'Role updated successfully'})
@@ -608,6 +611,7 @@ def api_admin_delete_user(user_id):
         
         # Permanently delete user
         if LoginAuth.delete_user(user.username):
+            invalidate_permission_cache()
             logger.info(f"🔐 Admin deleted user: {user.username}")
             return jsonify({'success': True, 'message': 'User deleted successfully'})
         else:
@@ -679,6 +683,7 @@ def api_admin_update_user_permissions(user_id):
         
         from core.db.ups import db
         db.session.commit()
+        invalidate_permission_cache()
         
         logger.info(f"🔐 Admin updated permissions for user {user.username}: {permissions}")
         
@@ -3,6 +3,7 @@ Database Module.
 This module provides functions and classes for interacting with the database.
 """
 
+import os
 import logging
 from flask_sqlalchemy import SQLAlchemy
 
@@ -12,6 +13,39 @@ from core.logger import database_logger as logger
 # Create a SQLAlchemy database instance
 db = SQLAlchemy()
 
+# Number of pooled SQLite connections kept open by an app engine (DB_POOL_SIZE env var)
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+
+def sqlite_engine_options(pool_size=DB_POOL_SIZE):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS shared by every Flask app that opens the SQLite database.
+    
+    File databases get SQLAlchemy's QueuePool, which hands each thread its own
+    connection (the pysqlite dialect disables check_same_thread for it).
+    """
+    return {
+        'pool_pre_ping': True,
+        'pool_size': pool_size,
+        # Keep more prepared statements per sqlite3 connection (default is 100)
+        'connect_args': {'cached_statements': 512},
+        # Bounded SQLAlchemy compiled-statement cache for the hot polling inserts
+        'query_cache_size': 1200
+    }
+
+def register_sqlite_pragmas(engine):
+    """Apply the SQLite PRAGMAs once per new DBAPI connection of engine"""
+    from sqlalchemy import event
+    
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, connection_record):
+        """WAL lets the polling writer and HTTP readers proceed without blocking each other"""
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
 # Import submodules
 from .model_classes import init_model_classes, register_models_for_global_access
 from .initializer import init_database
@@ -30,6 +64,9 @@ from .internal_checker import (
 # Export the public API
 __all__ = [
     'db',
+    'DB_POOL_SIZE',
+    'sqlite_engine_options',
+    'register_sqlite_pragmas',
     'init_model_classes',
     'register_models_for_global_access',
     'init_database',
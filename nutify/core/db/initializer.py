@@ -71,6 +71,13 @@ def init_database(app, db):
             logger.info("✅ UPS dynamic data table created")
         else:
             logger.info("✅ UPS dynamic data table already exists")
+            # Tables created by older versions miss the indexes declared on the model
+            for index in dynamic_model.__table__.indexes:
+                try:
+                    index.create(db.engine, checkfirst=True)
+                except Exception as e:
+                    # Queries still work without the index, just slower
+                    logger.warning(f"⚠️ Could not create index {index.name}: {str(e)}")
         
         logger.info("✅ UPS data models initialized successfully")
         
@@ -16,11 +16,30 @@ import re
 import os
 import json
 import socket
+import orjson
 
 from core.logger import system_logger as logger
 from core.settings import UPSC_BIN, UPSDRVCTL_BIN, UPSD_BIN, UPSMON_BIN, NUT_SCANNER_CMD, SERVER_HOST, SERVER_PORT, NUT_STOP_MONITOR_CMD, NUT_STOP_SERVER_CMD, NUT_STOP_DRIVER_CMD, NUT_START_DRIVER_CMD, NUT_START_SERVER_CMD, NUT_START_MONITOR_CMD, NUT_SERVICE_WAIT_TIME
 from core.db.ups.utils import ups_config
 
+def _post_internal_event(payload):
+    """
+    POST an event to /internal/ws_event on the local server (fire and forget).
+    
+    The body is encoded once with orjson, so Content-Length is the byte length.
+    Raises on connection errors; callers decide how to log them.
+    """
+    body = orjson.dumps(payload)
+    header = (
+        f"POST /internal/ws_event HTTP/1.1\r\n"
+        f"Host: {SERVER_HOST}:{SERVER_PORT}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"\r\n"
+    ).encode()
+    with socket.create_connection((SERVER_HOST, SERVER_PORT), timeout=1) as sock:
+        sock.sendall(header + body)
+
 class ConnectionMonitor:
     """
     UPS Connection Monitor that checks connection health and handles recovery.
@@ -567,24 +586,7 @@ class ConnectionMonitor:
                 
                 # Also try to notify via HTTP socket
                 try:
-                    msg_data = json.dumps(status_data)
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    sock.settimeout(1)  # 1 second timeout
-                    
-                    # Use the SERVER_HOST and SERVER_PORT from settings
-                    sock.connect((SERVER_HOST, SERVER_PORT))
-                    
-                    http_msg = (
-                        f"POST /internal/ws_event HTTP/1.1\r\n"
-                        f"Host: {SERVER_HOST}:{SERVER_PORT}\r\n"
-                        f"Content-Type: application/json\r\n"
-                        f"Content-Length: {len(msg_data)}\r\n"
-                        f"\r\n"
-                        f"{msg_data}"
-                    )
-                    
-                    sock.sendall(http_msg.encode())
-                    sock.close()
+                    _post_internal_event(status_data)
                     logger.info("✅ Sent USB reconnect attempt event to server")
                 except Exception as socket_err:
                     logger.warning(f"⚠️ Could not send WebSocket event: {str(socket_err)}")
@@ -763,28 +765,9 @@ class ConnectionMonitor:
                 "status": "RESTART_NEEDED"
             }
             
-            # Convert to JSON
-            json_message = json.dumps(restart_message)
-            
             # Try to send to the local Socket.IO server
             try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(1)  # 1 second timeout
-                
-                # Use the SERVER_HOST and SERVER_PORT from settings
-                sock.connect((SERVER_HOST, SERVER_PORT))
-                
-                http_msg = (
-                    f"POST /internal/ws_event HTTP/1.1\r\n"
-                    f"Host: {SERVER_HOST}:{SERVER_PORT}\r\n"
-                    f"Content-Type: application/json\r\n"
-                    f"Content-Length: {len(json_message)}\r\n"
-                    f"\r\n"
-                    f"{json_message}"
-                )
-                
-                sock.sendall(http_msg.encode())
-                sock.close()
+                _post_internal_event(restart_message)
                 logger.info("✅ Sent container restart needed notification to server")
             except Exception as e:
                 logger.warning(f"⚠️ Could not send container restart WebSocket event: {str(e)}")
@@ -881,26 +864,9 @@ class ConnectionMonitor:
                 "serial": self._usb_serial
             }
             
-            # Convert to JSON
-            json_message = json.dumps(message)
-            
             # Try to send to the local Socket.IO server
             try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(1)  # 1 second timeout
-                
-                # Use SERVER_HOST and SERVER_PORT from settings
-                sock.connect((SERVER_HOST, SERVER_PORT))
-                http_message = (
-                    f"POST /internal/ws_event HTTP/1.1\r\n"
-                    f"Host: {SERVER_HOST}:{SERVER_PORT}\r\n"
-                    f"Content-Type: application/json\r\n"
-                    f"Content-Length: {len(json_message)}\r\n"
-                    f"\r\n"
-                    f"{json_message}"
-                )
-                sock.sendall(http_message.encode())
-                sock.close()
+                _post_internal_event(message)
                 logger.debug("📤 Sent USB disconnect event to WebSocket server")
             except Exception as e:
                 logger.warning(f"⚠️ Failed to send USB disconnect event: {str(e)}")
@@ -13,6 +13,9 @@ Usage:
 
 from datetime import datetime
 
+# ModelClasses instance last passed to register_models_for_global_access
+_registered_models = None
+
 
 class ModelClasses:
     """Container for all database models used in the application."""
@@ -83,8 +86,14 @@ def register_models_for_global_access(models, db_instance):
         models: ModelClasses instance with initialized models
         db_instance: SQLAlchemy database instance
     """
+    global _registered_models
     from core.logger import database_logger as logger
     
+    # Already registered this exact set of models (e.g. init_app re-run by wsgi.py)
+    if models is _registered_models:
+        logger.debug("Models already registered for global access")
+        return
+    
     # Register models in db_module.py
     from core.db.ups import register_models_from_modelclasses
     register_models_from_modelclasses(models)
@@ -93,6 +102,7 @@ def register_models_for_global_access(models, db_instance):
     from core.db.ups import register_models_for_scheduler
     register_models_for_scheduler()
     
+    _registered_models = models
     logger.info("✅ Models registered for global access")
 
 
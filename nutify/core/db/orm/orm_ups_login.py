@@ -406,6 +406,9 @@ class LoginAuth:
         try:
             from core.db.ups import db
             db.session.commit()
+            # Drop cached require_permission results so the user loses access immediately
+            from core.auth import invalidate_permission_cache
+            invalidate_permission_cache()
             if logger:
                 logger.info(f"🔐 Deactivated user: {username}")
             return True
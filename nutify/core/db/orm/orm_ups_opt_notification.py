@@ -90,14 +90,12 @@ class NotificationSettings:
                 
             logger.info("No notification settings found, creating defaults")
             
-            # Create default settings
-            added_count = 0
-            for event_type in EmailNotifier.TEMPLATE_MAP.keys():
-                setting = cls(event_type=event_type, enabled=False)
-                app_db.session.add(setting)
-                added_count += 1
+            # Create default settings in a single executemany batch
+            rows = [{'event_type': event_type, 'enabled': False}
+                    for event_type in EmailNotifier.TEMPLATE_MAP.keys()]
+            app_db.session.bulk_insert_mappings(cls, rows)
                 
-            logger.info(f"Added {added_count} notification settings")
+            logger.info(f"Added {len(rows)} notification settings")
             
             # Commit the transaction
             try:
@@ -26,7 +26,8 @@ from core.db.ups.data import (
     calculate_daily_power, get_hourly_power
 )
 from core.db.ups.cache import (
-    UPSDataCache, save_ups_data, ups_data_cache, websocket, init_websocket
+    UPSDataCache, save_ups_data, ups_data_cache, websocket, init_websocket,
+    get_polling_interval, invalidate_polling_interval_cache
 )
 from core.db.ups.models import (
     is_static_field, get_available_ups_variables, create_static_model,
@@ -155,6 +156,8 @@ __all__ = [
     'UPSDataCache',
     'save_ups_data',
     'ups_data_cache',
+    'get_polling_interval',
+    'invalidate_polling_interval_cache',
     'is_static_field',
     'get_available_ups_variables',
     'create_static_model',
@@ -8,6 +8,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import threading
+import time
 import json
 from flask import current_app
 import pytz
@@ -24,6 +25,13 @@ data_lock = threading.Lock()
 # WebSocket instance for cache updates
 websocket = SocketIO()
 
+# Seconds a cached polling interval stays valid before VariableConfig is queried again
+POLLING_INTERVAL_TTL = 30
+
+# Cached polling interval shared by the polling thread and save_ups_data;
+# 'model' holds the VariableConfig class once it has been resolved
+_polling_interval_cache = {'value': 1, 'expires': 0, 'model': None}
+
 class UPSDataCache:
     """
     UPS data caching system for efficient data storage and aggregation.
@@ -144,7 +152,7 @@ class UPSDataCache:
                     if key in critical_fields:
                         logger.info(f"✅ Set critical field {key}={value} on UPSDynamicData")
                     else:
-                        logger.debug(f"✅ Set {key}={value} on UPSDynamicData")
+                        logger.debug("✅ Set %s=%s on UPSDynamicData", key, value)
                 else:
                     missing_keys.append(key)
                     logger.warning(f"⚠️ Key {key} not found in UPSDynamicData model")
@@ -240,7 +248,7 @@ class UPSDataCache:
         # Calculate the exact next minute in UTC
         next_minute_utc = utc_time.replace(second=0, microsecond=0) + timedelta(minutes=1)
         
-        logger.debug(f"Next save time calculated in UTC: {next_minute_utc}")
+        logger.debug("Next save time calculated in UTC: %s", next_minute_utc)
         return next_minute_utc
 
     def add(self, timestamp, data):
@@ -279,7 +287,7 @@ class UPSDataCache:
             df_data.append(row)
         
         self.df = pd.DataFrame(df_data)
-        logger.debug(f"📥 Added data point (buffer: {len(self.data)})")
+        logger.debug("📥 Added data point (buffer: %d)", len(self.data))
         
         # Broadcast cache update to clients via WebSocket
         self.broadcast_cache_update(formatted_data)
@@ -303,7 +311,7 @@ class UPSDataCache:
             
         # Check if current time is beyond next_save_time
         if current_utc >= self.next_save_time:
-            logger.debug(f"⏰ Time to save! Current UTC: {current_utc}, Save time: {self.next_save_time}")
+            logger.debug("⏰ Time to save! Current UTC: %s, Save time: %s", current_utc, self.next_save_time)
             return True
         else:
             return False
@@ -326,7 +334,8 @@ class UPSDataCache:
             logger.info("📊 Starting Pandas data processing...")
             
             # Log all columns for debugging
-            logger.debug(f"Available columns: {list(self.df.columns)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Available columns: %s", list(self.df.columns))
             
             # Check if ups_realpower exists in the data
             if 'ups_realpower' in self.df.columns:
@@ -508,7 +517,7 @@ class UPSDataCache:
             self.last_broadcast = broadcast_data.copy()
             
             # Broadcast the data
-            logger.debug(f"📡 Broadcasting cache update with {len(broadcast_data)} fields")
+            logger.debug("📡 Broadcasting cache update with %d fields", len(broadcast_data))
             websocket.emit('cache_update', broadcast_data)
             
         except Exception as e:
@@ -525,6 +534,49 @@ class UPSDataCache:
             return {}
         return self.last_broadcast
 
+def get_polling_interval(db):
+    """
+    Get the polling interval from VariableConfig, cached for POLLING_INTERVAL_TTL seconds
+    
+    Args:
+        db: Database instance
+        
+    Returns:
+        int: Polling interval in seconds, clamped to 1-60
+    """
+    now = time.monotonic()
+    if now < _polling_interval_cache['expires']:
+        return _polling_interval_cache['value']
+    
+    try:
+        # Resolve the model class once instead of on every refresh
+        model_class = _polling_interval_cache['model']
+        if model_class is None:
+            if hasattr(db, 'ModelClasses') and hasattr(db.ModelClasses, 'VariableConfig'):
+                model_class = db.ModelClasses.VariableConfig
+            else:
+                from core.db.ups import VariableConfig
+                model_class = VariableConfig
+            if model_class is not None:
+                _polling_interval_cache['model'] = model_class
+        
+        config = model_class.query.first()
+        polling_interval = config.polling_interval if config else 1
+    except Exception as e:
+        logger.error(f"Error getting polling interval: {str(e)}. Using default of 1 second.")
+        polling_interval = 1
+    
+    # Ensure polling_interval is within 1-60 seconds
+    polling_interval = max(1, min(60, polling_interval))
+    
+    _polling_interval_cache['value'] = polling_interval
+    _polling_interval_cache['expires'] = now + POLLING_INTERVAL_TTL
+    return polling_interval
+
+def invalidate_polling_interval_cache():
+    """Force the next get_polling_interval call to re-read VariableConfig"""
+    _polling_interval_cache['expires'] = 0
+
 def save_ups_data(db, UPSDynamicData, ups_data_cache):
     """
     Get the current UPS data and save it to the cache
@@ -544,25 +596,14 @@ def save_ups_data(db, UPSDynamicData, ups_data_cache):
         if not is_ups_connected():
             # If connection is not available, skip saving and return false
             error_msg = "UPS connection unavailable, skipping data collection"
-            logger.warning(f"⚠️ {error_msg}")
+            logger.warning("⚠️ %s", error_msg)
             return False, error_msg
         
         # Use UTC time directly for database operations
         now_utc = datetime.now(pytz.UTC)
         
-        # Get polling interval from VariableConfig
-        try:
-            if hasattr(db, 'ModelClasses') and hasattr(db.ModelClasses, 'VariableConfig'):
-                model_class = db.ModelClasses.VariableConfig
-            else:
-                from core.db.ups import VariableConfig
-                model_class = VariableConfig
-            
-            config = model_class.query.first()
-            polling_interval = config.polling_interval if config else 1
-        except Exception as e:
-            logger.error(f"Error getting polling interval: {str(e)}. Using default of 1 second.")
-            polling_interval = 1
+        # Get polling interval from VariableConfig (cached)
+        polling_interval = get_polling_interval(db)
         
         # Adjust cache size based on polling interval
         # For example, if cache seconds is 60 and polling_interval is 2,
@@ -587,9 +628,9 @@ def save_ups_data(db, UPSDynamicData, ups_data_cache):
 
         
         # Log the buffer
-        logger.debug(f"📥 Buffer status before add: {len(ups_data_cache.data)}")
+        logger.debug("📥 Buffer status before add: %d", len(ups_data_cache.data))
         ups_data_cache.add(now_utc, data_dict)
-        logger.debug(f"📥 Buffer status after add: {len(ups_data_cache.data)}")
+        logger.debug("📥 Buffer status after add: %d", len(ups_data_cache.data))
         
         # Check if it's time to save
         success = ups_data_cache.calculate_and_save_averages(db, UPSDynamicData, now_utc)
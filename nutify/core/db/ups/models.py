@@ -150,6 +150,8 @@ def get_ups_model(db=None):
     """
     Get the ORM model for the UPS dynamic data.
     Always returns the dynamically created model based on UPS data.
+    The model is built on the first call and memoized in _UPSDynamicData, so
+    request handlers can call this on every request without extra caching.
     
     Args:
         db: SQLAlchemy database instance (optional)
@@ -210,6 +212,8 @@ def create_static_model(db=None):
     """
     Create the ORM model for the static UPS data dynamically.
     Always creates the model dynamically based on UPS data.
+    Only the first call builds the model; later calls return the memoized
+    _UPSStaticData class.
     
     Args:
         db: SQLAlchemy database instance (optional)
@@ -400,7 +404,6 @@ def create_dynamic_model(db=None):
                 
     class UPSDynamicData(db.Model):
         __tablename__ = 'ups_dynamic_data'
-        __table_args__ = {'extend_existing': True}
         
         # Base fields always present
         id = db.Column(db.Integer, primary_key=True)
@@ -416,6 +419,16 @@ def create_dynamic_model(db=None):
         # Ensure ups_status is always present
         ups_status = db.Column(db.String(255))
         
+        # Partial index so the "latest non-zero ups_realpower_days" lookup is a single index seek
+        __table_args__ = (
+            db.Index(
+                'ix_ups_rpd_nz', timestamp_utc,
+                sqlite_where=ups_realpower_days.isnot(None) & (ups_realpower_days != 0),
+                postgresql_where=ups_realpower_days.isnot(None) & (ups_realpower_days != 0)
+            ),
+            {'extend_existing': True}
+        )
+        
         # Add dynamically columns based on UPS data
         for key, value in variables.items():
             # Convert the key format from NUT to DB
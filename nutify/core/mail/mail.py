@@ -1173,9 +1173,11 @@ def init_notification_settings():
         NotificationSettings = get_notification_settings_model()
         settings = NotificationSettings.query.all()
         if not settings:
-            for event_type in EmailNotifier.TEMPLATE_MAP.keys():
-                setting = NotificationSettings(event_type=event_type, enabled=False)
-                db.session.add(setting)
+            db.session.bulk_insert_mappings(
+                NotificationSettings,
+                [{'event_type': event_type, 'enabled': False}
+                 for event_type in EmailNotifier.TEMPLATE_MAP.keys()]
+            )
             db.session.commit()
             logger.info("Notification settings initialized")
             
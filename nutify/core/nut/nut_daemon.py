@@ -12,6 +12,7 @@ import subprocess
 import time
 import logging
 import shlex
+from functools import wraps
 from pathlib import Path
 from datetime import datetime
 
@@ -50,6 +51,33 @@ class NUTConfigError(NUTDaemonError):
     """Exception raised when NUT configuration is invalid or missing"""
     pass
 
+# Seconds a successful upsc probe is reused before the UPS is probed again
+UPS_LIVENESS_TTL = 1
+
+def _ttl_cache(seconds):
+    """
+    Cache successful (success, output) probe results for a number of seconds, keyed by arguments.
+    Failures are never cached so readiness polls keep probing. The wrapped function
+    gets an invalidate() method to drop all cached results.
+    """
+    def decorator(func):
+        cache = {}
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = args + tuple(sorted(kwargs.items()))
+            entry = cache.get(key)
+            if entry is not None and time.monotonic() - entry[1] < seconds:
+                return entry[0]
+            result = func(*args, **kwargs)
+            if result[0]:
+                cache[key] = (result, time.monotonic())
+            return result
+        
+        wrapper.invalidate = cache.clear
+        return wrapper
+    return decorator
+
 def get_nut_mode():
     """
     Determine the NUT mode from nut.conf
@@ -268,6 +296,7 @@ def get_ups_monitor_config():
         logger.error(f"Error reading UPS monitor configuration: {str(e)}")
         return None, None
 
+@_ttl_cache(UPS_LIVENESS_TTL)
 def test_ups_connection(ups_name, ups_host):
     """
     Test connection to UPS using upsc command
@@ -326,6 +355,32 @@ def test_ups_connection(ups_name, ups_host):
         system_logger.error(error_msg)
         return False, error_msg
 
+def wait_for_ups_ready(ups_name, ups_host, timeout=5, interval=0.1):
+    """
+    Poll the UPS with upsc until it answers or the timeout expires
+    
+    Args:
+        ups_name (str): UPS name
+        ups_host (str): UPS host
+        timeout (float): Maximum time to wait in seconds
+        interval (float): Initial delay between probes in seconds, doubled after each failure
+        
+    Returns:
+        bool: True if the UPS answered within the timeout, False otherwise
+    """
+    deadline = time.monotonic() + timeout
+    delay = interval
+    while True:
+        success, _ = test_ups_connection(ups_name, ups_host)
+        if success:
+            return True
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay *= 2
+
 def start_nut_services(wait_time=None):
     """
     Start all NUT services in the correct order
@@ -362,6 +417,10 @@ def start_nut_services(wait_time=None):
 ####### FROM HERE - MACOS DEVELOPMENT COMPATIBILITY - REMOVE IN PRODUCTION #######   
     
     start_timestamp = time.time()
+    
+    # Services are about to be restarted, earlier liveness results no longer hold
+    test_ups_connection.invalidate()
+    
     logger.info("============================================================")
     logger.info("=====               STARTING NUT SERVICES              =====")
     logger.info("============================================================")
@@ -843,6 +902,9 @@ def stop_nut_services(wait_time=None):
     # Use configured wait time if not specified
     if wait_time is None:
         wait_time = NUT_SERVICE_WAIT_TIME
+    
+    # Services are going down, earlier liveness results no longer hold
+    test_ups_connection.invalidate()
         
     results = {
         'upsmon': {'success': False, 'error': None},
@@ -857,7 +919,8 @@ def stop_nut_services(wait_time=None):
         result = subprocess.run(
             NUT_STOP_MONITOR_CMD,
             shell=True,
-            capture_output=True, 
+            stdout=subprocess.DEVNULL,  # only stderr is reported
+            stderr=subprocess.PIPE,
             text=True,
             timeout=10
         )
@@ -878,7 +941,8 @@ def stop_nut_services(wait_time=None):
         result = subprocess.run(
             NUT_STOP_SERVER_CMD,
             shell=True,
-            capture_output=True, 
+            stdout=subprocess.DEVNULL,  # only stderr is reported
+            stderr=subprocess.PIPE,
             text=True,
             timeout=10
         )
@@ -899,7 +963,8 @@ def stop_nut_services(wait_time=None):
         result = subprocess.run(
             NUT_STOP_DRIVER_CMD,
             shell=True,
-            capture_output=True, 
+            stdout=subprocess.DEVNULL,  # only stderr is reported
+            stderr=subprocess.PIPE,
             text=True,
             timeout=10
         )
@@ -922,9 +987,12 @@ def stop_nut_services(wait_time=None):
         try:
             logger.warning("Attempting to forcefully stop any running services...")
             # Don't really need to check results here, just best effort
-            subprocess.run(NUT_STOP_MONITOR_CMD, shell=True, timeout=5, check=False)
-            subprocess.run(NUT_STOP_SERVER_CMD, shell=True, timeout=5, check=False)
-            subprocess.run(NUT_STOP_DRIVER_CMD, shell=True, timeout=5, check=False)
+            subprocess.run(NUT_STOP_MONITOR_CMD, shell=True, timeout=5, check=False,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            subprocess.run(NUT_STOP_SERVER_CMD, shell=True, timeout=5, check=False,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            subprocess.run(NUT_STOP_DRIVER_CMD, shell=True, timeout=5, check=False,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         except Exception as inner_e:
             logger.error(f"Error in cleanup: {str(inner_e)}")
             
@@ -1123,10 +1123,11 @@ def save_database_config(server_name, timezone):
                 from app import CACHE_TIMEZONE as app_cache_timezone
                 # Need to use a reference to the global variable
                 import app
-                app.CACHE_TIMEZONE = pytz.timezone(timezone)
+                # Resolve through the app's cached lookup so both references share one tz object
+                app.CACHE_TIMEZONE = app._tz(timezone)
                 # Also update the Flask app attribute
                 if hasattr(current_app, 'CACHE_TIMEZONE'):
-                    current_app.CACHE_TIMEZONE = pytz.timezone(timezone)
+                    current_app.CACHE_TIMEZONE = app.CACHE_TIMEZONE
                 logger.info(f"✅ Updated global CACHE_TIMEZONE to: {timezone}")
             except Exception as tz_error:
                 logger.warning(f"⚠️ Could not update global CACHE_TIMEZONE: {str(tz_error)}")
@@ -19,7 +19,7 @@ from .options import (
     get_variable_config
 )
 from core.logger import options_logger as logger
-from core.db.ups import db, VariableConfig
+from core.db.ups import db, VariableConfig, invalidate_polling_interval_cache
 from core.settings import LOG, LOG_LEVEL, LOG_WERKZEUG, UPS_CONF_PATH
 from core.mail import test_notification, get_mail_config_model
 import subprocess
@@ -505,6 +505,7 @@ def update_polling_interval():
             
             # Try to commit changes to database
             db.session.commit()
+            invalidate_polling_interval_cache()
             logger.info(f"Polling interval updated to {polling_interval} seconds")
             
             return jsonify({
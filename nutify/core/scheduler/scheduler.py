@@ -1,6 +1,8 @@
 import schedule
 import threading
 import time
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, date
 from core.logger import get_logger
 from flask import request, jsonify, current_app, has_app_context
@@ -123,6 +125,12 @@ class Scheduler:
         self.report_manager = None
         self._initialized = False
         self._thread = None
+        # Jobs run on a worker pool so a slow report doesn't hold up the run_pending loop
+        self._executor = ThreadPoolExecutor(
+            max_workers=min(32, (os.cpu_count() or 4) * 2),
+            thread_name_prefix='scheduler'
+        )
+        self._running_jobs = {}
         if app:
             self.init_app(app)
         scheduler_logger.info("📅 Scheduler instance created")
@@ -236,12 +244,13 @@ class Scheduler:
                     # Configure job based on cron parts
                     if minute != "*":
                         for m in minute.split(','):
-                            schedule.every().day.at(f"{hour.zfill(2)}:{m.zfill(2)}").do(job_function).tag(job_id)
+                            schedule.every().day.at(f"{hour.zfill(2)}:{m.zfill(2)}").do(self._dispatch, job_id, job_function).tag(job_id)
                     else:
                         # For complex schedules, use a more generic approach
                         schedule.every().minute.do(
                             lambda: self._should_run_job(
-                                minute, hour, day, month, day_of_week, job_function
+                                minute, hour, day, month, day_of_week,
+                                lambda: self._dispatch(job_id, job_function)
                             )
                         ).tag(job_id)
                     
@@ -292,7 +301,7 @@ class Scheduler:
                 
                 if days_str == "*" or days_str == "":
                     # Schedule daily job
-                    schedule.every().day.at(time_str).do(job_function).tag(job_id)
+                    schedule.every().day.at(time_str).do(self._dispatch, job_id, job_function).tag(job_id)
                     scheduler_logger.info(f"✅ Added daily job {job_id} at {time_str}")
                 else:
                     # Schedule for specific days
@@ -304,7 +313,7 @@ class Scheduler:
                     day_list = [int(d) for d in days_str.split(',') if d.strip().isdigit()]
                     for d in day_list:
                         if d in day_mapping:
-                            getattr(schedule.every(), day_mapping[d]).at(time_str).do(job_function).tag(job_id)
+                            getattr(schedule.every(), day_mapping[d]).at(time_str).do(self._dispatch, job_id, job_function).tag(job_id)
                             scheduler_logger.info(f"✅ Added job {job_id} for {day_mapping[d]} at {time_str}")
                 return True
         except Exception as e:
@@ -347,6 +356,17 @@ class Scheduler:
         # Direct comparison
         return current == int(cron_part)
     
+    def _dispatch(self, job_id, job_function):
+        """
+        Submit a due job to the worker pool, skipping it while a previous run
+        of the same job is still in progress (only called from the scheduler loop)
+        """
+        running = self._running_jobs.get(job_id)
+        if running is not None and not running.done():
+            scheduler_logger.warning(f"⚠️ Job {job_id} is still running, skipping this run")
+            return
+        self._running_jobs[job_id] = self._executor.submit(job_function)
+
     def _remove_job(self, job_id):
         """Remove a job from the scheduler"""
         try:
@@ -0,0 +1,21 @@
+"""
+Gunicorn server hooks for the SSL deployment (see app.py __main__).
+"""
+
+import sys
+
+
+def post_fork(server, worker):
+    """
+    Drop any SQLAlchemy connections inherited from the master process so the
+    worker builds its own pool on first query.
+    """
+    # Without --preload the app is only imported inside the worker, so there is
+    # nothing to dispose of (and importing it here would initialize it twice)
+    app_module = sys.modules.get('app')
+    if app_module is None:
+        return
+
+    with app_module.app.app_context():
+        # close=False leaves the parent's sockets alone and just forgets them
+        app_module.db.engine.dispose(close=False)
@@ -17,6 +17,7 @@ class AdvancedNutConfigManager {
         this.collapseHeaderEl = null;
         this.collapseContentEl = null;
         this.downloadUpsJsonBtnEl = null;
+        this.bundle = null;
         this.isInitialized = false;
     }
 
@@ -96,13 +97,21 @@ class AdvancedNutConfigManager {
     }
 
     /**
-     * Load the list of available NUT configuration files
+     * Load the available NUT configuration files together with their content
+     * and documentation in a single request
      */
     async loadAvailableFiles() {
         try {
-            const response = await fetch('/api/advanced/nut/files');
+            const response = await fetch('/api/advanced/nut/bundle');
             const data = await response.json();
 
+            if (data.success && data.files) {
+                this.bundle = {
+                    files: Object.fromEntries(data.files.map(file => [file.name, file])),
+                    documentation: data.documentation || {}
+                };
+            }
+
             if (data.success && data.files && this.fileSelectEl) {
                 // Clear current options
                 this.fileSelectEl.innerHTML = '<option value="">Select a file</option>';
@@ -143,8 +152,14 @@ class AdvancedNutConfigManager {
      */
     async loadConfig(filename) {
         try {
-            const response = await fetch(`/api/advanced/nut/config/${filename}`);
-            const data = await response.json();
+            // Use the bundle loaded with the file list, fetching only if the file isn't in it
+            let data;
+            if (this.bundle && this.bundle.files[filename]) {
+                data = { success: true, config: this.bundle.files[filename] };
+            } else {
+                const response = await fetch(`/api/advanced/nut/config/${filename}`);
+                data = await response.json();
+            }
 
             if (data.success && data.config) {
                 this.currentFile = filename;
@@ -172,8 +187,16 @@ class AdvancedNutConfigManager {
      */
     async loadDocumentation(filename) {
         try {
-            const response = await fetch(`/api/advanced/nut/docs/${filename}`);
-            const data = await response.json();
+            // Use the bundle when it has the file, otherwise fall back to the per-file endpoints
+            let data;
+            let fileData;
+            if (this.bundle && this.bundle.files[filename]) {
+                data = { success: true, documentation: this.bundle.documentation[filename] || {} };
+                fileData = { success: true, config: this.bundle.files[filename] };
+            } else {
+                const response = await fetch(`/api/advanced/nut/docs/${filename}`);
+                data = await response.json();
+            }
 
             if (data.success && this.docsContainerEl) {
                 // Clear current documentation
@@ -182,8 +205,10 @@ class AdvancedNutConfigManager {
                 // Add file description header
                 const fileHeader = document.createElement('div');
                 fileHeader.className = 'file-description';
-                const fileDescriptionResponse = await fetch(`/api/advanced/nut/config/${filename}`);
-                const fileData = await fileDescriptionResponse.json();
+                if (!fileData) {
+                    const fileDescriptionResponse = await fetch(`/api/advanced/nut/config/${filename}`);
+                    fileData = await fileDescriptionResponse.json();
+                }
                 
                 if (fileData.success && fileData.config && fileData.config.description) {
                     fileHeader.innerHTML = `
@@ -386,6 +411,9 @@ class AdvancedNutConfigManager {
             if (data.success) {
                 this.showAlert(`${this.currentFile} saved successfully`, 'success');
                 this.originalContent = content;
+                if (this.bundle && this.bundle.files[this.currentFile]) {
+                    this.bundle.files[this.currentFile].content = content;
+                }
             } else {
                 this.showAlert(`Failed to save ${this.currentFile}: ${data.message}`, 'error');
             }
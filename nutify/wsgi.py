@@ -0,0 +1,10 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from app import app, socketio, init_app
+
+# Initialize the application when running with gunicorn
+init_app()
+
+if __name__ == '__main__':
+    socketio.run(app)
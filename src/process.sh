@@ -128,8 +128,8 @@ monitor_services() {
     
     # Infinite loop to keep the script running and monitoring services
     while true; do
-        # Check if web app is still running
-        if ! check_process "python3" || ! check_process "app.py"; then
+        # Check if web app is still running (app.py replaces itself with gunicorn when SSL is enabled)
+        if { ! check_process "python3" || ! check_process "app.py"; } && ! check_process "wsgi:app"; then
             if [ "$ENABLE_LOG_STARTUP" = "Y" ]; then
                 startup_log "Web application not running, restarting..."
             fi